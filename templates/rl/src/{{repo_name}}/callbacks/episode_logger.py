@@ -3,85 +3,165 @@
 :class:`EpisodeLoggerCallback` runs greedy evaluation rollouts at the end of
 each evaluation epoch and logs mean episode reward and length to the trainer's
 logger (e.g. Weights & Biases).
+
+All evaluation episodes run concurrently in a dedicated vector env built
+from the datamodule's ``env_id``, so one batched ``act_deterministic``
+call serves every episode per step and neither the training env nor
+PPO's rollout envs are touched.
 """
 
 from __future__ import annotations
 
+import warnings
+from functools import partial
+
 import gymnasium as gym
 import numpy as np
 import torch
 import lightning as L
 
+from ..data.vector_env import make_vector_env
+
 
 class EpisodeLoggerCallback(L.Callback):
     """Periodically evaluates the agent with greedy rollouts and logs metrics.
 
     At the end of every ``log_every_n_epochs`` training epochs the callback:
 
-    1. Runs ``eval_episodes`` deterministic episodes in the datamodule's
-       environment using the actor's greedy (mean) action.
+    1. Runs ``eval_episodes`` deterministic episodes on ``num_eval_envs``
+       copies of the environment, stepped together as one vector env and
+       acting with a single batched forward per step.
     2. Logs ``eval/mean_episode_reward`` and ``eval/mean_episode_length``
        to the trainer logger.
 
+    Works with both ``RLDataModule`` (whose observation normaliser, if any,
+    is applied) and ``RolloutDataModule``.  The eval env is created on first
+    use, reset with fixed seeds before every evaluation (so successive
+    evaluations start from the same states) and closed when training ends.
+
     Args:
         eval_episodes: Number of greedy episodes to run per evaluation.
         log_every_n_epochs: How often (in Lightning epochs) to run evaluation.
+        num_eval_envs: Environment copies stepped together; ``None`` runs
+            every episode at once.  With fewer envs than episodes each env
+            plays a fixed share of them back to back.
+        vector_backend: ``"sync"``, ``"async"`` or ``"shared_memory"`` —
+            use an async backend when stepping the env dominates.
+        max_eval_steps: Budget of environment steps per evaluation, summed
+            over envs.  Episodes still running when it is spent are logged
+            with their partial reward and length; episodes not yet started
+            are dropped.  ``None`` = no budget.
+        seed: Base seed of the eval envs (env ``i`` gets ``seed + i``).
     """
 
-    def __init__(self, eval_episodes: int = 5, log_every_n_epochs: int = 10) -> None:
+    def __init__(
+        self,
+        eval_episodes: int = 5,
+        log_every_n_epochs: int = 10,
+        num_eval_envs: int | None = None,
+        vector_backend: str = "sync",
+        max_eval_steps: int | None = None,
+        seed: int = 10_000,
+    ) -> None:
         super().__init__()
         self.eval_episodes = eval_episodes
         self.log_every_n_epochs = log_every_n_epochs
+        self.num_eval_envs = min(num_eval_envs or eval_episodes, eval_episodes)
+        self.vector_backend = vector_backend
+        self.max_eval_steps = max_eval_steps
+        self.seed = seed
+        self._envs: gym.vector.VectorEnv | None = None
 
     def on_train_epoch_end(self, trainer: L.Trainer, pl_module: L.LightningModule) -> None:
         """Run evaluation rollouts and log results.
 
         Args:
             trainer: The active Lightning trainer.
-            pl_module: The agent LightningModule (SACModule or TD3Module).
+            pl_module: The agent LightningModule (any module with ``act_deterministic``).
         """
         if (trainer.current_epoch + 1) % self.log_every_n_epochs != 0:
             return
 
         dm = trainer.datamodule
-        # RolloutDataModule (PPO) doesn't have dm.env — skip rollout-based eval
-        if dm is None or not hasattr(dm, "env") or dm.env is None:
+        if dm is None or "env_id" not in dm.hparams:
             return
 
-        rewards: list[float] = []
-        lengths: list[int] = []
+        rewards, lengths = self.evaluate(pl_module, dm)
+        pl_module.log("eval/mean_episode_reward", float(np.mean(rewards)), prog_bar=True)
+        pl_module.log("eval/mean_episode_length", float(np.mean(lengths)), prog_bar=False)
+
+    def teardown(self, trainer: L.Trainer, pl_module: L.LightningModule, stage: str) -> None:
+        if self._envs is not None:
+            self._envs.close()
+            self._envs = None
 
+    def evaluate(self, pl_module: L.LightningModule, dm: L.LightningDataModule) -> tuple[list[float], list[int]]:
+        """Play ``eval_episodes`` greedy episodes and return their rewards and lengths.
+
+        Args:
+            pl_module: Agent exposing ``act_deterministic(obs: (B, obs_dim))``.
+            dm: Datamodule with ``hparams.env_id``; its ``_maybe_normalize``
+                is applied to observations when present.
+
+        Returns:
+            ``(episode_rewards, episode_lengths)`` — ``eval_episodes`` long
+            unless ``max_eval_steps`` cut the evaluation short.
+        """
+        if self._envs is None:
+            env_fn = partial(gym.make, dm.hparams.env_id)
+            self._envs = make_vector_env([env_fn] * self.num_eval_envs, self.vector_backend, context=None)
+        envs, num_envs = self._envs, self.num_eval_envs
+        normalize = getattr(dm, "_maybe_normalize", None)
+        is_discrete = isinstance(envs.single_action_space, gym.spaces.Discrete)
+
+        # Fixed per-env shares keep short episodes from crowding out long ones
+        remaining = np.array([(self.eval_episodes + i) // num_envs for i in range(num_envs)])
+        returns = np.zeros(num_envs)
+        lengths = np.zeros(num_envs, dtype=np.int64)
+        autoreset = np.zeros(num_envs, dtype=bool)
+        episode_rewards: list[float] = []
+        episode_lengths: list[int] = []
+        max_vector_steps = None if self.max_eval_steps is None else max(self.max_eval_steps // num_envs, 1)
+
+        obs, _ = envs.reset(seed=[self.seed + i for i in range(num_envs)])
+        was_training = pl_module.training
         pl_module.eval()
+        step = 0
         with torch.no_grad():
-            for _ in range(self.eval_episodes):
-                obs, _ = dm.env.reset()
+            while remaining.any() and (max_vector_steps is None or step < max_vector_steps):
                 obs = obs.astype(np.float32)
-                episode_reward = 0.0
-                episode_length = 0
-                done = False
-
-                while not done:
-                    obs_normalised = dm._maybe_normalize(obs)
-                    obs_t = torch.tensor(obs_normalised).unsqueeze(0).to(pl_module.device)
-                    action = pl_module.act_deterministic(obs_t)
-                    action_np = action.squeeze(0).cpu().numpy()
-                    if isinstance(dm.env.action_space, gym.spaces.Discrete):
-                        step_action = int(np.round(float(action_np.flat[0])))
-                    else:
-                        step_action = action_np.astype(np.float32)
-                    obs, reward, terminated, truncated, _ = dm.env.step(step_action)
-                    obs = obs.astype(np.float32)
-                    episode_reward += float(reward)
-                    episode_length += 1
-                    done = bool(terminated) or bool(truncated)
-
-                rewards.append(episode_reward)
-                lengths.append(episode_length)
-
-        pl_module.train()
-
-        mean_reward = float(np.mean(rewards))
-        mean_length = float(np.mean(lengths))
-
-        pl_module.log("eval/mean_episode_reward", mean_reward, prog_bar=True)
-        pl_module.log("eval/mean_episode_length", mean_length, prog_bar=False)
+                obs_t = torch.from_numpy(normalize(obs) if normalize is not None else obs).to(pl_module.device)
+                action_np = pl_module.act_deterministic(obs_t).cpu().numpy()
+                if is_discrete:
+                    step_action = np.rint(action_np).reshape(num_envs).astype(np.int64)
+                else:
+                    step_action = action_np.astype(np.float32).reshape(num_envs, -1)
+                obs, reward, terminated, truncated, _ = envs.step(step_action)
+                step += 1
+
+                # Next-step autoreset: an env's first step after an episode ends only resets it
+                counting = ~autoreset & (remaining > 0)
+                returns[counting] += reward[counting]
+                lengths[counting] += 1
+                done = (terminated | truncated) & counting
+                for i in np.flatnonzero(done):
+                    episode_rewards.append(float(returns[i]))
+                    episode_lengths.append(int(lengths[i]))
+                remaining[done] -= 1
+                returns[done] = 0.0
+                lengths[done] = 0
+                autoreset = terminated | truncated
+
+        if remaining.any():
+            warnings.warn(
+                f"EpisodeLoggerCallback: max_eval_steps={self.max_eval_steps} reached, "
+                "unfinished episodes are logged with partial returns.",
+                stacklevel=2,
+            )
+            for i in np.flatnonzero((remaining > 0) & (lengths > 0)):
+                episode_rewards.append(float(returns[i]))
+                episode_lengths.append(int(lengths[i]))
+
+        if was_training:
+            pl_module.train()
+        return episode_rewards, episode_lengths
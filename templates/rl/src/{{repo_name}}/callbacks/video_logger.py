@@ -7,12 +7,21 @@ how the policy evolves throughout training.
 Uses ``gymnasium.wrappers.RecordVideo`` to write the episode to an mp4 file
 on disk, then passes the file path to ``wandb.Video`` — the approach
 recommended by the WandB Gymnasium integration docs.
+
+Rendering, encoding and upload run on a background thread against a CPU
+copy of the agent, so the training loop only pays for a weight snapshot.
 """
 
 from __future__ import annotations
 
+import copy
+import queue
+import shutil
 import tempfile
+import threading
+import warnings
 from pathlib import Path
+from typing import Any, NamedTuple
 
 import numpy as np
 import torch
@@ -21,21 +30,39 @@ import gymnasium as gym
 from gymnasium.wrappers import RecordVideo
 
 
+class _VideoJob(NamedTuple):
+    """Everything the worker needs to record one episode, detached from the live run."""
+
+    state_dict: dict[str, torch.Tensor]
+    obs_normalizer: Any
+    experiment: Any
+    epoch: int
+    global_step: int
+
+
 class VideoLoggerCallback(L.Callback):
     """Renders a greedy episode and logs it as a WandB video.
 
     At the end of every ``log_every_n_epochs`` training epochs the callback:
 
-    1. Creates a *separate* ``RecordVideo``-wrapped environment so the
-       training environment is never disturbed.
-    2. Runs one deterministic episode using the agent's greedy policy.
-    3. Passes the recorded mp4 file to ``wandb.Video`` for upload.
+    1. Snapshots the agent's weights (and the datamodule's observation
+       normaliser) to the CPU and queues a recording job.
+    2. A worker thread loads the snapshot into its own copy of the agent,
+       runs one deterministic episode in a ``RecordVideo``-wrapped render
+       environment — created once and reused, never the training env — and
+       passes the mp4 to ``wandb.Video``.
+
+    The queue holds at most ``max_pending_jobs``; when recording falls
+    behind, the oldest waiting job is dropped so the newest policy is
+    always the next one recorded.  Jobs still queued when training ends are
+    finished before the worker shuts down.
 
     Args:
         log_every_n_epochs: How often (in Lightning epochs) to record a video.
         fps: Frame-rate for the uploaded video.
         max_episode_steps: Hard cap on episode length to avoid runaway rollouts.
             ``None`` uses the environment's own time limit.
+        max_pending_jobs: Capacity of the job queue.
     """
 
     def __init__(
@@ -43,18 +70,27 @@ class VideoLoggerCallback(L.Callback):
         log_every_n_epochs: int = 50,
         fps: int = 30,
         max_episode_steps: int | None = 500,
+        max_pending_jobs: int = 1,
     ) -> None:
         super().__init__()
         self.log_every_n_epochs = log_every_n_epochs
         self.fps = fps
         self.max_episode_steps = max_episode_steps
+        self.max_pending_jobs = max_pending_jobs
+        self.dropped_jobs = 0
+
+        self._queue: queue.Queue[_VideoJob | None] | None = None
+        self._worker: threading.Thread | None = None
+        self._agent: L.LightningModule | None = None
+        self._env: RecordVideo | None = None
+        self._video_dir: str | None = None
 
     def on_train_epoch_end(self, trainer: L.Trainer, pl_module: L.LightningModule) -> None:
-        """Render and log a video episode.
+        """Snapshot the agent and queue a video recording.
 
         Args:
             trainer: The active Lightning trainer.
-            pl_module: The agent LightningModule (SACModule or TD3Module).
+            pl_module: The agent LightningModule (any module with ``act_deterministic``).
         """
         if (trainer.current_epoch + 1) % self.log_every_n_epochs != 0:
             return
@@ -68,103 +104,139 @@ class VideoLoggerCallback(L.Callback):
             return
 
         try:
-            import wandb
+            import wandb  # noqa: F401
         except ImportError:
             return
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            video_path = self._record_episode(pl_module, dm, tmpdir)
-            if video_path is None:
-                return
-
-            try:
-                trainer.logger.experiment.log(
-                    {
-                        "eval/episode_video": wandb.Video(
-                            str(video_path),
-                            fps=self.fps,
-                            format="mp4",
-                            caption=f"Epoch {trainer.current_epoch + 1}",
-                        )
-                    },
-                    step=trainer.global_step,
-                )
-            except Exception as exc:
-                # Never crash training because of a logging failure — but do warn
-                import warnings
-                warnings.warn(f"VideoLoggerCallback: failed to log video to WandB: {exc}", stacklevel=2)
+        if self._worker is None:
+            self._start_worker(pl_module, dm.hparams.env_id)
+        job = _VideoJob(
+            state_dict={k: v.detach().to("cpu", copy=True) for k, v in pl_module.state_dict().items()},
+            obs_normalizer=copy.deepcopy(getattr(dm, "obs_normalizer", None)),
+            experiment=trainer.logger.experiment,
+            epoch=trainer.current_epoch + 1,
+            global_step=trainer.global_step,
+        )
+        self._submit(job)
+
+    def teardown(self, trainer: L.Trainer, pl_module: L.LightningModule, stage: str) -> None:
+        """Finish queued recordings and stop the worker."""
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join()
+            self._worker = None
+            self._queue = None
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
-    def _record_episode(
-        self,
-        pl_module: L.LightningModule,
-        dm: L.LightningDataModule,
-        video_dir: str,
-    ) -> Path | None:
-        """Roll out one greedy episode and save it as an mp4 via RecordVideo.
+    def _start_worker(self, pl_module: L.LightningModule, env_id: str) -> None:
+        # The worker acts with its own CPU copy; everything but the network state is shared, not copied
+        memo = {id(v): v for k, v in vars(pl_module).items() if k not in ("_modules", "_parameters", "_buffers")}
+        self._agent = copy.deepcopy(pl_module, memo).to("cpu").eval()
+        self._queue = queue.Queue(maxsize=self.max_pending_jobs)
+        self._worker = threading.Thread(target=self._run, args=(env_id,), name="video-logger", daemon=True)
+        self._worker.start()
+
+    def _submit(self, job: _VideoJob) -> None:
+        """Enqueue ``job``, evicting the oldest waiting job when the queue is full."""
+        while True:
+            try:
+                self._queue.put_nowait(job)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped_jobs += 1
+                except queue.Empty:
+                    pass
+
+    def _run(self, env_id: str) -> None:
+        """Worker loop: record and upload queued jobs until the ``None`` sentinel arrives."""
+        try:
+            while (job := self._queue.get()) is not None:
+                try:
+                    video_path = self._record_episode(job, env_id)
+                    if video_path is not None:
+                        self._upload(job, video_path)
+                        video_path.unlink(missing_ok=True)
+                except Exception as exc:
+                    # Never crash training because of a logging failure — but do warn
+                    warnings.warn(f"VideoLoggerCallback: video logging failed: {exc}", stacklevel=2)
+        finally:
+            if self._env is not None:
+                self._env.close()
+                self._env = None
+            if self._video_dir is not None:
+                shutil.rmtree(self._video_dir, ignore_errors=True)
+                self._video_dir = None
 
-        A fresh environment is created and torn down inside this method
-        so that the training environment (``dm.env``) is untouched.
+    def _record_episode(self, job: _VideoJob, env_id: str) -> Path | None:
+        """Roll out one greedy episode with the job's weights and save it as an mp4 via RecordVideo.
+
+        The render environment is created on the first job and reused, so
+        the training environment (``dm.env``) is untouched.
 
         Args:
-            pl_module: Agent module with an ``actor`` attribute.
-            dm: Datamodule with ``hparams.env_id`` and ``_maybe_normalize``.
-            video_dir: Directory where the mp4 will be written.
+            job: Weight snapshot and normaliser to act with.
+            env_id: Gymnasium id of the environment to render.
 
         Returns:
-            Path to the recorded mp4, or ``None`` if recording failed.
+            Path to the recorded mp4, or ``None`` if nothing was recorded.
         """
-        env_id: str = dm.hparams.env_id
-
-        try:
-            base_env = gym.make(env_id, render_mode="rgb_array")
-            # Record exactly one episode (episode_trigger always returns True)
-            env = RecordVideo(
-                base_env,
-                video_folder=video_dir,
-                episode_trigger=lambda _: True,
-                disable_logger=True,
-            )
-        except Exception as exc:
-            import warnings
-            warnings.warn(f"VideoLoggerCallback: could not create render env: {exc}", stacklevel=2)
-            return None
-
-        pl_module.eval()
-        try:
-            obs, _ = env.reset()
-            obs = obs.astype(np.float32)
-            done = False
-            step = 0
-
-            with torch.no_grad():
-                while not done:
-                    obs_normalised = dm._maybe_normalize(obs)
-                    obs_t = torch.tensor(obs_normalised).unsqueeze(0).to(pl_module.device)
-
-                    action_np = pl_module.act_deterministic(obs_t).squeeze(0).cpu().numpy()
-                    if isinstance(base_env.action_space, gym.spaces.Discrete):
-                        step_action = int(np.round(float(action_np.flat[0])))
-                    else:
-                        step_action = action_np.astype(np.float32)
-                    obs, _, terminated, truncated, _ = env.step(step_action)
-                    obs = obs.astype(np.float32)
-                    done = bool(terminated) or bool(truncated)
-                    step += 1
-
-                    if self.max_episode_steps is not None and step >= self.max_episode_steps:
-                        break
-        except Exception as exc:
-            import warnings
-            warnings.warn(f"VideoLoggerCallback: episode recording failed: {exc}", stacklevel=2)
-            return None
-        finally:
-            env.close()
-            pl_module.train()
-
-        # RecordVideo names files like "rl-video-episode-0.mp4"
-        mp4_files = sorted(Path(video_dir).glob("*.mp4"))
-        return mp4_files[0] if mp4_files else None
+        if self._env is None:
+            try:
+                self._video_dir = tempfile.mkdtemp(prefix="video-logger-")
+                # Record every episode (episode_trigger always returns True)
+                self._env = RecordVideo(
+                    gym.make(env_id, render_mode="rgb_array"),
+                    video_folder=self._video_dir,
+                    episode_trigger=lambda _: True,
+                    disable_logger=True,
+                )
+            except Exception as exc:
+                warnings.warn(f"VideoLoggerCallback: could not create render env: {exc}", stacklevel=2)
+                return None
+
+        env, agent = self._env, self._agent
+        agent.load_state_dict(job.state_dict)
+        is_discrete = isinstance(env.action_space, gym.spaces.Discrete)
+
+        obs, _ = env.reset()
+        done = False
+        step = 0
+        with torch.no_grad():
+            while not done:
+                obs = obs.astype(np.float32)
+                if job.obs_normalizer is not None:
+                    obs = job.obs_normalizer.normalize(obs)
+                action_np = agent.act_deterministic(torch.from_numpy(obs).unsqueeze(0)).squeeze(0).numpy()
+                if is_discrete:
+                    step_action = int(np.round(float(action_np.flat[0])))
+                else:
+                    step_action = action_np.astype(np.float32)
+                obs, _, terminated, truncated, _ = env.step(step_action)
+                done = bool(terminated) or bool(truncated)
+                step += 1
+
+                if self.max_episode_steps is not None and step >= self.max_episode_steps:
+                    break
+        # The reused env would otherwise only write the file on its next reset
+        env.stop_recording()
+        video_path = Path(self._video_dir) / f"{env.name_prefix}-episode-{env.episode_id}.mp4"
+        return video_path if video_path.exists() else None
+
+    def _upload(self, job: _VideoJob, video_path: Path) -> None:
+        import wandb
+
+        # Logged against trainer/global_step (WandbLogger's x-axis) rather than wandb's
+        # own step, which has moved on by the time a background upload lands
+        job.experiment.log(
+            {
+                "eval/episode_video": wandb.Video(
+                    str(video_path), fps=self.fps, format="mp4", caption=f"Epoch {job.epoch}"
+                ),
+                "trainer/global_step": job.global_step,
+            }
+        )
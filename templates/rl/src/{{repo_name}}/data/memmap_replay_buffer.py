@@ -0,0 +1,141 @@
+"""Disk-backed replay buffer on ``np.memmap`` files.
+
+:class:`MemmapReplayBuffer` keeps the storage of
+:class:`~.replay_buffer.ReplayBuffer` in ``.npy`` memory maps under a
+directory, so capacity is bounded by disk rather than RAM — the OS page
+cache holds only the rows actually touched.  Sampling sorts the drawn
+indices before gathering, so each batch reads the files front to back.
+
+A directory that already holds a buffer with the same layout is reopened
+and filling resumes where the last :meth:`MemmapReplayBuffer.flush` left
+off.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from .replay_buffer import Batch, ReplayBuffer, _synchronized
+
+_META_FILE = "meta.json"
+
+
+class MemmapReplayBuffer(ReplayBuffer):
+    """:class:`~.replay_buffer.ReplayBuffer` whose storage lives in memory-mapped files.
+
+    Every storage tensor is a zero-copy view of ``<directory>/<name>.npy``,
+    so all layouts (standard, compact, n-step) work unchanged.  Fill level
+    and write pointer are recorded in ``meta.json`` by :meth:`flush`;
+    transitions still pending in the n-step rings are not persisted, and a
+    resumed compact buffer closes off the interrupted episodes like
+    :meth:`~.replay_buffer.ReplayBuffer.load_chunks` does.
+
+    Args:
+        obs_dim: Dimensionality of the observation space.
+        action_dim: Dimensionality of the action space.
+        buffer_size: Maximum number of transitions to store.
+        directory: Where the ``.npy`` files and ``meta.json`` are kept.
+            Created if missing; resumed from if it holds a flushed buffer.
+        **kwargs: Forwarded to :class:`~.replay_buffer.ReplayBuffer`
+            (``device`` must stay ``"cpu"``).
+
+    Raises:
+        ValueError: If ``device`` is not the CPU, the files in ``directory``
+            do not match the requested layout, or ``directory`` holds
+            ``.npy`` files without a ``meta.json``.
+    """
+
+    def __init__(
+        self,
+        obs_dim: int,
+        action_dim: int,
+        buffer_size: int,
+        directory: str | Path,
+        **kwargs,
+    ) -> None:
+        if torch.device(kwargs.get("device", "cpu")).type != "cpu":
+            msg = "MemmapReplayBuffer storage is host memory; sample(device=...) moves batches instead."
+            raise ValueError(msg)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        meta_path = self.directory / _META_FILE
+        self._meta = json.loads(meta_path.read_text()) if meta_path.exists() else None
+        if self._meta is None and any(self.directory.glob("*.npy")):
+            # Never flushed (or not a buffer directory): the files cannot be resumed, and w+ would wipe them
+            msg = (
+                f"{self.directory} holds .npy files but no {_META_FILE}; "
+                "remove them or choose another directory for the replay buffer."
+            )
+            raise ValueError(msg)
+        self._memmaps: list[np.memmap] = []
+
+        super().__init__(obs_dim, action_dim, buffer_size, **kwargs)
+
+        if self._meta is not None:
+            layout = self._layout()
+            stored = {key: self._meta.get(key) for key in layout}
+            if stored != layout:
+                msg = f"Cannot resume replay buffer from {self.directory}: stored layout {stored}, expected {layout}."
+                raise ValueError(msg)
+            self._ptr, self._size = self._meta["ptr"], self._meta["size"]
+            if self.compact and self._size:
+                # The environments restart, so the interrupted episodes end here
+                self._recount_padding()
+                self._close_pending_block(self._pending_next_obs.numpy())
+
+    @_synchronized
+    def flush(self) -> None:
+        """Write dirty pages to disk and record the fill level for resuming."""
+        for memmap in self._memmaps:
+            memmap.flush()
+        meta = {"ptr": self._ptr, "size": self._size, **self._layout()}
+        (self.directory / _META_FILE).write_text(json.dumps(meta))
+
+    def save_chunks(self, directory: str | Path, chunk_size: int = 65_536) -> dict:  # noqa: ARG002
+        """Flush the memmap files and return their state — they already are the checkpoint.
+
+        ``directory`` is ignored; :meth:`load_chunks` reads the memmap
+        directory itself, or copies from it into a buffer elsewhere.
+        """
+        self.flush()
+        state = super().save_chunks(self.directory, chunk_size)
+        state["format"] = "memmap"
+        return state
+
+    def _write_chunks(self, directory: Path, chunk_size: int) -> None:
+        pass  # the .npy files are the saved copy
+
+    def _read_chunks(self, state: dict) -> None:
+        if Path(state["directory"]).resolve() != self.directory.resolve():
+            super()._read_chunks(state)
+
+    def _layout(self) -> dict:
+        """Settings that change what the files mean — a resumed buffer must match them."""
+        return {"compact": self.compact, "num_envs": self._num_envs, "n_step": self.n_step, "gamma": self.gamma}
+
+    def _alloc(self, name: str, shape: tuple[int, ...], dtype: torch.dtype = torch.float32) -> torch.Tensor:
+        path = self.directory / f"{name}.npy"
+        np_dtype = torch.empty(0, dtype=dtype).numpy().dtype
+        if self._meta is not None:
+            if not path.exists():
+                msg = f"Cannot resume replay buffer from {self.directory}: {path.name} is missing."
+                raise ValueError(msg)
+            memmap = np.load(path, mmap_mode="r+")
+            if memmap.shape != shape or memmap.dtype != np_dtype:
+                msg = (
+                    f"Cannot resume replay buffer from {path}: stored {memmap.dtype}{memmap.shape}, "
+                    f"expected {np_dtype}{shape}."
+                )
+                raise ValueError(msg)
+        else:
+            memmap = np.lib.format.open_memmap(path, mode="w+", dtype=np_dtype, shape=shape)
+        self._memmaps.append(memmap)
+        return torch.from_numpy(memmap)
+
+    def _gather(self, idx: torch.Tensor, device: torch.device | str | None) -> Batch:
+        # Ascending rows turn the gather into one forward sweep over each file
+        return super()._gather(torch.sort(idx).values, device)
@@ -0,0 +1,279 @@
+"""Prioritized experience replay (Schaul et al., 2016) on array segment trees.
+
+:class:`PrioritizedReplayBuffer` samples transition ``i`` with probability
+``P(i) = p_i^α / Σ_k p_k^α`` and returns importance-sampling weights
+``w_i = (N · P(i))^-β / max_k w_k`` on the :class:`~.replay_buffer.Batch`.
+Agents feed absolute TD errors back through
+:meth:`PrioritizedReplayBuffer.update_priorities`.
+
+Priorities live in two complete binary trees stored as flat arrays
+(:class:`SumSegmentTree` and :class:`MinSegmentTree`).  Batched updates
+recompute only the ancestors of the touched leaves, and stratified
+sampling descends all ``B`` queries level by level, so both cost
+``O(B log N)`` regardless of capacity.
+"""
+
+from __future__ import annotations
+
+import operator
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import torch
+
+from .replay_buffer import Batch, ReplayBuffer, _synchronized
+
+
+class _SegmentTree:
+    """Complete binary tree over ``capacity`` leaves stored in one flat array.
+
+    Node ``1`` is the root, node ``k`` has children ``2k`` and ``2k + 1``, and
+    leaf ``i`` sits at ``capacity + i`` (capacity rounded up to a power of 2).
+    """
+
+    def __init__(self, capacity: int, op: np.ufunc, scalar_op: Callable[[float, float], float], neutral: float) -> None:
+        self._depth = max(capacity - 1, 0).bit_length()
+        self.capacity = 1 << self._depth
+        self._op = op
+        self._scalar_op = scalar_op
+        self._tree = np.full(2 * self.capacity, neutral, dtype=np.float64)
+
+    def update(self, idx: np.ndarray | int, values: np.ndarray | float) -> None:
+        """Set leaves ``idx`` to ``values`` and refresh their ancestors, one level at a time.
+
+        Shared ancestors are recomputed once per descendant — every copy
+        writes the same value, so deduplicating them is not worth its cost.
+        Levels with no more nodes than updates are rebuilt whole from
+        contiguous slices instead, which is cheaper than a gather.
+        """
+        tree = self._tree
+        if np.ndim(idx) == 0:
+            self._update_leaf(int(idx), float(values))
+            return
+        nodes = np.asarray(idx) + self.capacity
+        tree[nodes] = values
+        level = self.capacity
+        for _ in range(self._depth):
+            level >>= 1
+            if len(nodes) >= level:
+                tree[level: 2 * level] = self._op(tree[2 * level: 4 * level: 2], tree[2 * level + 1: 4 * level: 2])
+                continue
+            nodes = nodes >> 1
+            tree[nodes] = self._op(tree.take(2 * nodes), tree.take(2 * nodes + 1))
+
+    def _update_leaf(self, idx: int, value: float) -> None:
+        """Scalar path for single-transition inserts, free of per-level array overhead."""
+        tree, op = self._tree, self._scalar_op
+        node = idx + self.capacity
+        tree[node] = value
+        while node > 1:
+            node >>= 1
+            tree[node] = op(tree.item(2 * node), tree.item(2 * node + 1))
+
+    def __getitem__(self, idx: np.ndarray) -> np.ndarray:
+        return self._tree[np.asarray(idx) + self.capacity]
+
+    @property
+    def root(self) -> float:
+        return float(self._tree[1])
+
+
+class SumSegmentTree(_SegmentTree):
+    """Segment tree of sums with batched prefix-sum search."""
+
+    def __init__(self, capacity: int) -> None:
+        super().__init__(capacity, np.add, operator.add, 0.0)
+
+    def find_prefix_sum(self, mass: np.ndarray) -> np.ndarray:
+        """Return, for each query, the leaf ``i`` whose cumulative-sum interval contains ``mass``."""
+        nodes = np.ones(len(mass), dtype=np.int64)
+        mass = np.array(mass, dtype=np.float64)
+        for _ in range(self._depth):
+            nodes <<= 1
+            left = self._tree.take(nodes)
+            go_right = mass > left
+            mass -= left * go_right
+            nodes += go_right
+        return nodes - self.capacity
+
+
+class MinSegmentTree(_SegmentTree):
+    """Segment tree of minima."""
+
+    def __init__(self, capacity: int) -> None:
+        super().__init__(capacity, np.minimum, min, np.inf)
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """Replay buffer with proportional prioritized sampling.
+
+    New transitions enter with the largest priority seen so far, so each is
+    likely to be replayed at least once.  Sampling is stratified: the total
+    priority mass is split into ``batch_size`` equal segments and one
+    transition is drawn from each.  Sampled batches carry ``weights``
+    (importance-sampling corrections, max-normalised to 1), plus
+    ``indices`` and ``generations`` to pass back to :meth:`update_priorities`.
+
+    Works with both the standard and the compact storage layout; compact
+    padding rows get zero priority and are never drawn.
+
+    Args:
+        obs_dim: Dimensionality of the observation space.
+        action_dim: Dimensionality of the action space.
+        buffer_size: Maximum number of transitions to store.
+        alpha: Prioritisation exponent ``α`` (``0`` = uniform).
+        beta: Importance-sampling exponent ``β`` (``1`` = full correction).
+            A plain attribute, so callers may anneal it during training.
+        eps: Added to ``|δ|`` so no transition reaches zero priority.
+        **kwargs: Forwarded to :class:`~.replay_buffer.ReplayBuffer`.
+    """
+
+    def __init__(
+        self,
+        obs_dim: int,
+        action_dim: int,
+        buffer_size: int,
+        alpha: float = 0.6,
+        beta: float = 0.4,
+        eps: float = 1e-6,
+        **kwargs,
+    ) -> None:
+        super().__init__(obs_dim, action_dim, buffer_size, **kwargs)
+        self.alpha = alpha
+        self.beta = beta
+        self.eps = eps
+        self._sum_tree = SumSegmentTree(buffer_size)
+        self._min_tree = MinSegmentTree(buffer_size)
+        self._max_priority = 1.0
+        # Write count at which each row was last written, to spot rows replaced after sampling
+        self._row_generation = np.zeros(buffer_size, dtype=np.int64)
+
+    # ------------------------------------------------------------------
+    # Public interface
+    # ------------------------------------------------------------------
+
+    @_synchronized
+    def sample(self, batch_size: int, device: torch.device | str | None = None) -> Batch:
+        """Sample a stratified prioritized mini-batch.
+
+        Args:
+            batch_size: Number of transitions to sample.
+            device: Device to return the batch on (default: the storage device).
+
+        Returns:
+            A :class:`~.replay_buffer.Batch` with ``weights``, ``indices``
+            and ``generations`` set.
+
+        Raises:
+            ValueError: If the buffer contains fewer sampleable transitions
+                than ``batch_size``, or none with a non-zero priority.
+        """
+        if self.num_valid < batch_size:
+            msg = f"Buffer has {self.num_valid} transitions, cannot sample {batch_size}."
+            raise ValueError(msg)
+
+        total = self._sum_tree.root
+        if total <= 0:
+            msg = "Every stored transition has zero priority, cannot sample."
+            raise ValueError(msg)
+        segment = total / batch_size
+        # 1 - U[0, 1) lies in (0, 1], so no query lands on a zero-mass boundary at 0
+        mass = (np.arange(batch_size) + 1.0 - np.random.random(batch_size)) * segment
+        idx = self._sum_tree.find_prefix_sum(mass)
+        # Round-off in the tree sums can still steer a query onto a zero-priority leaf
+        # (compact padding or an unfilled row), whose IS weight would be infinite — redraw it
+        zero = self._sum_tree[idx] <= 0
+        while zero.any():
+            idx[zero] = self._sum_tree.find_prefix_sum((1.0 - np.random.random(int(zero.sum()))) * total)
+            zero = self._sum_tree[idx] <= 0
+
+        # w_i / max_k w_k = (p_i / p_min)^-β — the N and total-mass factors cancel
+        weights = (self._sum_tree[idx] / self._min_tree.root) ** -self.beta
+
+        idx_t = torch.from_numpy(idx).to(self.device)
+        batch = self._gather(idx_t, device)
+        batch.weights = torch.as_tensor(weights, dtype=torch.float32).to(batch.obs.device, non_blocking=True)
+        batch.indices = idx_t
+        batch.generations = torch.from_numpy(self._row_generation[idx]).to(self.device)
+        return batch
+
+    @_synchronized
+    def update_priorities(
+        self, indices: torch.Tensor, td_errors: torch.Tensor, generations: torch.Tensor | None = None
+    ) -> None:
+        """Set the priorities of ``indices`` to ``(|td_errors| + eps)^α``.
+
+        Agents update after collecting more experience, and prefetched
+        batches are older still, so a sampled row may since have been
+        overwritten by a new transition (which keeps its max priority) or,
+        in the compact layout, by a padding row (which must stay at zero).
+        Both are skipped: rows whose generation changed, and padding rows.
+
+        Args:
+            indices: ``(B,)`` buffer indices from :attr:`Batch.indices`.
+            td_errors: ``(B,)`` TD errors of those transitions (any device).
+            generations: ``(B,)`` :attr:`Batch.generations` of the same
+                batch.  ``None`` trusts ``indices`` to still hold the
+                sampled transitions.
+        """
+        idx = indices.detach().cpu().numpy()
+        priorities = np.abs(td_errors.detach().float().cpu().numpy()) + self.eps
+        current = np.ones(len(idx), dtype=bool)
+        if generations is not None:
+            current &= self._row_generation[idx] == generations.detach().cpu().numpy()
+        if self.compact:
+            current &= self._valid[torch.from_numpy(idx).to(self.device)].cpu().numpy()
+        idx, priorities = idx[current], priorities[current]
+        if len(idx):
+            self._max_priority = max(self._max_priority, float(priorities.max()))
+            self._set_priorities(idx, priorities)
+
+    @_synchronized
+    def save_chunks(self, directory: str | Path, chunk_size: int = 65_536) -> dict:
+        """As :meth:`ReplayBuffer.save_chunks`, plus the priorities of the filled rows."""
+        state = super().save_chunks(directory, chunk_size)
+        state["priorities"] = torch.from_numpy(self._sum_tree[np.arange(self._size)])
+        state["max_priority"] = self._max_priority
+        return state
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _restore_extra(self, state: dict) -> None:
+        scaled = state["priorities"].numpy()
+        self._max_priority = state["max_priority"]
+        if len(scaled):
+            idx = np.arange(len(scaled))
+            self._sum_tree.update(idx, scaled)
+            self._min_tree.update(idx, np.where(scaled > 0, scaled, np.inf))
+
+    def _set_priorities(self, idx: np.ndarray, priorities: np.ndarray) -> None:
+        scaled = priorities ** self.alpha
+        self._sum_tree.update(idx, scaled)
+        # Zero-priority (compact padding) rows must not drag the minimum to 0
+        self._min_tree.update(idx, np.where(scaled > 0, scaled, np.inf))
+
+    def _write_row(self, values: tuple) -> None:
+        idx = self._ptr
+        super()._write_row(values)
+        self._row_generation[idx] = self._num_written
+        # values[-1] is the compact layout's valid flag; padding rows are never sampled
+        priority = self._max_priority if not self.compact or values[-1] else 0.0
+        scaled = priority ** self.alpha
+        self._sum_tree.update(idx, scaled)
+        self._min_tree.update(idx, scaled if scaled > 0 else np.inf)
+
+    def _write(self, values: tuple, n: int) -> None:
+        start = self._ptr
+        super()._write(values, n)
+        self._prioritize_new_rows(start, n)
+
+    def _prioritize_new_rows(self, start: int, n: int) -> None:
+        idx = (start + np.arange(n)) % self._buffer_size
+        self._row_generation[idx] = self._num_written
+        priorities = np.full(n, self._max_priority)
+        if self.compact:
+            priorities[~self._valid[torch.from_numpy(idx).to(self.device)].cpu().numpy()] = 0.0
+        self._set_priorities(idx, priorities)
@@ -4,15 +4,37 @@ Stores (obs, action, reward, next_obs, done) transitions collected during
 environment interaction. The ``done`` flag encodes *only* genuine terminations
 (``terminated=True``); episode truncations are intentionally stored as ``done=0``
 so that the value-function bootstrap is not masked on time-limit boundaries.
+
+With ``n_step > 1`` each stored transition is an n-step transition
+``(s_t, a_t, Σ_k γ^k r_{t+k}, s_{t+m}, done, γ^m)``, where ``m ≤ n`` is
+shortened at episode ends.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import functools
+import math
+import os
+import threading
+from dataclasses import dataclass, fields
+from pathlib import Path
 
 import numpy as np
 import torch
 
+_CHUNK_FILE = "chunk_{:05d}.npz"
+
+
+def _synchronized(method):
+    """Run ``method`` under the buffer's lock, so a prefetching thread can sample while the agent writes."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
 
 @dataclass
 class Batch:
@@ -25,6 +47,17 @@ class Batch:
     - ``reward``:   ``(B,)``
     - ``next_obs``: ``(B, obs_dim)``
     - ``done``:     ``(B,)``  — 1.0 only on genuine termination, 0.0 on truncation
+
+    With n-step returns, ``reward`` is the discounted n-step return and
+    ``discount`` ``(B,)`` holds the bootstrap discount ``γ^m`` for
+    ``next_obs``; it is ``None`` for single-step transitions, where the
+    agent's ``γ`` applies.
+
+    Batches from a :class:`~.prioritized_replay_buffer.PrioritizedReplayBuffer`
+    also carry importance-sampling ``weights`` ``(B,)``, the buffer
+    ``indices`` ``(B,)`` (int64) of the sampled rows and their write
+    ``generations`` ``(B,)`` (int64), which let priority updates skip rows
+    overwritten since sampling; all three are ``None`` for uniform sampling.
     """
 
     obs: torch.Tensor
@@ -32,39 +65,171 @@ class Batch:
     reward: torch.Tensor
     next_obs: torch.Tensor
     done: torch.Tensor
+    discount: torch.Tensor | None = None
+    weights: torch.Tensor | None = None
+    indices: torch.Tensor | None = None
+    generations: torch.Tensor | None = None
+
+    def to(self, device: torch.device | str, non_blocking: bool = False) -> Batch:
+        """Return a copy of the batch with every tensor moved to ``device``."""
+        return Batch(*(
+            None if (value := getattr(self, f.name)) is None else value.to(device, non_blocking=non_blocking)
+            for f in fields(self)
+        ))
+
+    def split(self, batch_size: int) -> list[Batch]:
+        """Split into consecutive batches of ``batch_size`` rows — views, no copies."""
+        columns = [None if (value := getattr(self, f.name)) is None else value.split(batch_size) for f in fields(self)]
+        return [Batch(*(None if c is None else c[i] for c in columns)) for i in range(len(columns[0]))]
 
 
 class ReplayBuffer:
     """Fixed-capacity circular experience replay buffer.
 
-    Transitions are stored as numpy arrays (CPU). Sampling returns a
-    :class:`Batch` of float32 ``torch.Tensor`` objects on CPU; move to the
-    correct device inside the training loop.
+    Transitions are stored in preallocated float32 ``torch.Tensor`` storage:
+    on the CPU by default, in pinned host memory (``pin_memory=True``) or
+    directly on an accelerator (``device="cuda"``).  Sampling gathers rows
+    with ``index_select`` — one copy per field instead of a numpy fancy-index
+    followed by a tensor conversion — and :meth:`sample` can deliver the
+    batch straight to the learner's device.
+
+    **Compact layout** (``compact=True``) stores every observation once and
+    drops the ``next_obs`` array, halving observation memory.  Rows are
+    written in blocks of ``num_envs`` (one per vector-env step, in env
+    order), so the successor of row ``i`` is row ``i + num_envs`` and
+    ``next_obs`` is reconstructed from it at sample time.  Episode ends are
+    bridged by the autoreset step that follows them: it is stored as a
+    non-sampleable row whose observation is the episode's final observation.
+    :meth:`add` inserts that row itself; :meth:`add_batch` callers pass it
+    with ``valid=False``.  The newest block's ``next_obs`` is held aside
+    until its successors arrive.  ``len()`` counts these padding rows;
+    :attr:`num_valid` does not.
+
+    **N-step returns** (``n_step > 1``) hold each env's last ``n_step``
+    transitions in a small ring.  Every insert appends to the rings of all
+    envs at once; a transition is written to the buffer when ``n_step``
+    rewards have accumulated, or when its episode ends, which flushes the
+    env's ring with shortened horizons.  The discounted sums are matrix
+    products with a precomputed ``γ^(k-j)`` table, so the work happens once
+    per insert instead of once per sample.  ``done`` marks termination
+    within the horizon and :attr:`Batch.discount` carries ``γ^m``.
 
     Args:
         obs_dim: Dimensionality of the observation space.
         action_dim: Dimensionality of the action space.
         buffer_size: Maximum number of transitions to store.
+        device: Where the storage lives.  A CUDA device makes sampling
+            entirely device-side (no host→device copy per gradient step).
+        pin_memory: Keep CPU storage in pinned memory and gather batches into
+            a preallocated pinned staging batch, so the transfer to the
+            learner's device is non-blocking.  Ignored when CUDA is
+            unavailable or ``device`` is not the CPU.
+        compact: Use the compact layout described above.
+        num_envs: Rows per :meth:`add_batch` call in the compact and
+            n-step modes.
+        n_step: Return horizon ``n`` (``1`` = standard one-step transitions).
+        gamma: Discount used for n-step returns.
+
+    Raises:
+        ValueError: If ``n_step > 1`` is combined with ``compact=True``.
     """
 
-    def __init__(self, obs_dim: int, action_dim: int, buffer_size: int) -> None:
+    def __init__(
+        self,
+        obs_dim: int,
+        action_dim: int,
+        buffer_size: int,
+        device: torch.device | str = "cpu",
+        pin_memory: bool = False,
+        compact: bool = False,
+        num_envs: int = 1,
+        n_step: int = 1,
+        gamma: float = 0.99,
+    ) -> None:
+        if n_step > 1 and compact:
+            msg = "n-step returns need explicit next_obs storage and are not supported with compact=True."
+            raise ValueError(msg)
         self._obs_dim = obs_dim
         self._action_dim = action_dim
         self._buffer_size = buffer_size
+        self.device = torch.device(device)
+        self.pin_memory = pin_memory and self.device.type == "cpu" and torch.cuda.is_available()
+        self.compact = compact
+        self._num_envs = num_envs
+
+        self._obs = self._alloc("obs", (buffer_size, obs_dim))
+        self._action = self._alloc("action", (buffer_size, action_dim))
+        self._reward = self._alloc("reward", (buffer_size,))
+        self._next_obs = None if compact else self._alloc("next_obs", (buffer_size, obs_dim))
+        self._done = self._alloc("done", (buffer_size,))
+        self._discount = self._alloc("discount", (buffer_size,)) if n_step > 1 else None
+        # Compact layout only: sampleable-row mask and the newest block's next_obs
+        self._valid = self._alloc("valid", (buffer_size,), torch.bool) if compact else None
+        self._pending_next_obs = self._alloc("pending_next_obs", (num_envs, obs_dim)) if compact else None
 
-        self._obs = np.zeros((buffer_size, obs_dim), dtype=np.float32)
-        self._action = np.zeros((buffer_size, action_dim), dtype=np.float32)
-        self._reward = np.zeros(buffer_size, dtype=np.float32)
-        self._next_obs = np.zeros((buffer_size, obs_dim), dtype=np.float32)
-        self._done = np.zeros(buffer_size, dtype=np.float32)
+        # n-step mode only: per-env rings of not-yet-complete transitions,
+        # oldest first, and the table G[j, k] = γ^(k-j) (k ≥ j) that turns
+        # ring rewards into discounted returns
+        self.n_step = n_step
+        self.gamma = gamma
+        if n_step > 1:
+            self._ring_obs = np.zeros((num_envs, n_step, obs_dim), dtype=np.float32)
+            self._ring_action = np.zeros((num_envs, n_step, action_dim), dtype=np.float32)
+            self._ring_reward = np.zeros((num_envs, n_step), dtype=np.float64)
+            self._ring_len = np.zeros(num_envs, dtype=np.int64)
+            k = np.arange(n_step)
+            self._return_weights = np.triu(gamma ** (k[np.newaxis] - k[:, np.newaxis]).astype(np.float64))
+
+        # numpy views sharing CPU storage — writes through them avoid per-call tensor overhead
+        self._host_views: tuple[np.ndarray, ...] | None = (
+            tuple(t.numpy() for t in self._storage()) if self.device.type == "cpu" else None
+        )
 
         self._ptr = 0      # next write position
         self._size = 0     # current fill level
+        self._num_padding = 0  # compact layout: filled rows with valid=False
+        self._num_written = 0  # rows ever written — locates the rows changed since the last save
+
+        # Directory holding a complete chunked copy and _num_written at that save
+        self._synced_dir: Path | None = None
+        self._synced_written = 0
+
+        # Pinned staging batches reused by sample(), one per batch size (the
+        # prefetched batch and a multi-step sample differ); each event marks
+        # when the last non-blocking copy out of its batch has finished
+        self._staging: dict[int, Batch] = {}
+        self._staging_events: dict[int, torch.cuda.Event] = {}
+
+        # Guards the public methods — re-entrant so subclasses can wrap them
+        self._lock = threading.RLock()
+
+    def _alloc(
+        self, name: str, shape: tuple[int, ...], dtype: torch.dtype = torch.float32  # noqa: ARG002
+    ) -> torch.Tensor:
+        """Allocate the zero-filled storage tensor ``name`` (disk-backed subclasses override this)."""
+        return torch.zeros(shape, dtype=dtype, device=self.device, pin_memory=self.pin_memory)
+
+    def _named_storage(self) -> dict[str, torch.Tensor]:
+        """Per-row storage tensors by name, as saved in checkpoint chunks."""
+        named = {
+            "obs": self._obs, "action": self._action, "reward": self._reward, "next_obs": self._next_obs,
+            "done": self._done, "discount": self._discount, "valid": self._valid,
+        }
+        return {name: tensor for name, tensor in named.items() if tensor is not None}
+
+    def _storage(self) -> tuple[torch.Tensor, ...]:
+        """Per-row storage tensors, in the order :meth:`_write` expects values."""
+        if self.compact:
+            return self._obs, self._action, self._reward, self._done, self._valid
+        if self._discount is not None:
+            return self._obs, self._action, self._reward, self._next_obs, self._done, self._discount
+        return self._obs, self._action, self._reward, self._next_obs, self._done
 
     # ------------------------------------------------------------------
     # Public interface
     # ------------------------------------------------------------------
 
+    @_synchronized
     def add(
         self,
         obs: np.ndarray,
@@ -72,14 +237,15 @@ class ReplayBuffer:
         reward: float,
         next_obs: np.ndarray,
         terminated: bool,
-        truncated: bool,  # noqa: ARG002 — accepted but ignored by design
+        truncated: bool,
     ) -> None:
         """Store a single transition.
 
         ``truncated`` is accepted for API compatibility with the Gymnasium step
         return, but it is intentionally ignored: only genuine ``terminated``
         episodes set ``done=1``. This preserves correct value-function
-        bootstrapping for time-limited environments.
+        bootstrapping for time-limited environments.  (The compact layout
+        uses it only to detect the episode end.)
 
         Args:
             obs: Current observation.
@@ -89,39 +255,400 @@ class ReplayBuffer:
             terminated: True if the episode ended due to a terminal state.
             truncated: True if the episode ended due to a time limit (ignored).
         """
-        self._obs[self._ptr] = obs
-        self._action[self._ptr] = action
-        self._reward[self._ptr] = reward
-        self._next_obs[self._ptr] = next_obs
-        self._done[self._ptr] = float(terminated)  # truncation intentionally excluded
+        if self.n_step > 1:
+            # Env 0's ring; truncation only flushes it, it never sets done
+            self._push_n_step(
+                np.asarray(obs)[np.newaxis], np.asarray(action)[np.newaxis], np.array([reward]),
+                np.asarray(next_obs)[np.newaxis], np.array([terminated]), np.array([terminated or truncated]),
+                np.ones(1, dtype=bool),
+            )
+            return
+        if self.compact:
+            self._write_row((obs, action, reward, float(terminated), True))
+            if self._host_views is not None:
+                self._pending_next_obs.numpy()[0] = next_obs
+            else:
+                self._pending_next_obs[0] = torch.as_tensor(next_obs)
+            if terminated or truncated:
+                # Padding row carrying the final observation as the successor's obs
+                self._write_row((next_obs, np.zeros(self._action_dim), 0.0, 0.0, False))
+            return
+        self._write_row((obs, action, reward, next_obs, float(terminated)))  # truncation intentionally excluded
 
-        self._ptr = (self._ptr + 1) % self._buffer_size
-        self._size = min(self._size + 1, self._buffer_size)
+    @_synchronized
+    def add_batch(
+        self,
+        obs: np.ndarray,
+        action: np.ndarray,
+        reward: np.ndarray,
+        next_obs: np.ndarray,
+        terminated: np.ndarray,
+        truncated: np.ndarray,  # noqa: ARG002 — accepted but ignored by design
+        valid: np.ndarray | None = None,
+    ) -> None:
+        """Store ``N`` transitions at once, e.g. one step of a vector env.
+
+        Equivalent to ``N`` calls to :meth:`add` in order, but written as at
+        most two contiguous slice copies per field (split where the write
+        wraps past the end of the buffer).  If ``N`` exceeds the capacity
+        only the last ``buffer_size`` transitions are kept.
+
+        Args:
+            obs: ``(N, obs_dim)`` current observations.
+            action: ``(N, action_dim)`` actions taken.
+            reward: ``(N,)`` immediate rewards.
+            next_obs: ``(N, obs_dim)`` observations after the actions.
+            terminated: ``(N,)`` genuine-termination flags.
+            truncated: ``(N,)`` time-limit flags (ignored, see :meth:`add`).
+            valid: ``(N,)`` mask; ``False`` marks autoreset steps, which are
+                dropped (standard layout) or kept as padding rows (compact).
+
+        Raises:
+            ValueError: In the compact or n-step mode, if ``N != num_envs``.
+        """
+        if self.n_step > 1:
+            if len(reward) != self._num_envs:
+                msg = f"n-step ReplayBuffer expects {self._num_envs} rows per add_batch, got {len(reward)}."
+                raise ValueError(msg)
+            valid = np.ones(len(reward), dtype=bool) if valid is None else np.asarray(valid, dtype=bool)
+            ended = np.logical_or(terminated, truncated)
+            self._push_n_step(obs, action, reward, next_obs, np.asarray(terminated, dtype=bool), ended, valid)
+            return
+        if self.compact:
+            if len(reward) != self._num_envs:
+                msg = f"Compact ReplayBuffer expects {self._num_envs} rows per add_batch, got {len(reward)}."
+                raise ValueError(msg)
+            valid = np.ones(len(reward), dtype=bool) if valid is None else valid
+            self._write((obs, action, reward, terminated, valid), n=len(reward))
+            self._pending_next_obs.copy_(torch.as_tensor(np.asarray(next_obs, dtype=np.float32)))
+            return
+
+        if valid is not None:
+            obs, action, reward, next_obs, terminated = (
+                x[valid] for x in (obs, action, reward, next_obs, terminated)
+            )
+        n = len(reward)
+        if n > self._buffer_size:
+            obs, action, reward, next_obs, terminated = (
+                x[-self._buffer_size:] for x in (obs, action, reward, next_obs, terminated)
+            )
+            self._ptr = (self._ptr + n - self._buffer_size) % self._buffer_size
+            n = self._buffer_size
+        self._write((obs, action, reward, next_obs, terminated), n)  # truncation intentionally excluded
 
-    def sample(self, batch_size: int) -> Batch:
+    @_synchronized
+    def sample(self, batch_size: int, device: torch.device | str | None = None) -> Batch:
         """Sample a uniformly random mini-batch of transitions.
 
         Args:
             batch_size: Number of transitions to sample.
+            device: Device to return the batch on (default: the storage
+                device).  From pinned storage the copy is non-blocking.
 
         Returns:
-            A :class:`Batch` of float32 tensors on CPU.
+            A :class:`Batch` of float32 tensors on ``device``.
 
         Raises:
-            ValueError: If the buffer contains fewer transitions than ``batch_size``.
+            ValueError: If the buffer contains fewer sampleable transitions
+                than ``batch_size``.
         """
-        if self._size < batch_size:
-            msg = f"Buffer has {self._size} transitions, cannot sample {batch_size}."
+        if self.num_valid < batch_size:
+            msg = f"Buffer has {self.num_valid} transitions, cannot sample {batch_size}."
             raise ValueError(msg)
 
-        idx = np.random.randint(0, self._size, size=batch_size)
-        return Batch(
-            obs=torch.tensor(self._obs[idx]),
-            action=torch.tensor(self._action[idx]),
-            reward=torch.tensor(self._reward[idx]),
-            next_obs=torch.tensor(self._next_obs[idx]),
-            done=torch.tensor(self._done[idx]),
-        )
+        idx = torch.randint(self._size, (batch_size,), device=self.device)
+        if self.compact:
+            # Redraw padding rows — they are a small fraction, so this converges quickly
+            invalid = ~self._valid[idx]
+            while invalid.any():
+                idx[invalid] = torch.randint(self._size, (int(invalid.sum()),), device=self.device)
+                invalid = ~self._valid[idx]
+        return self._gather(idx, device)
 
     def __len__(self) -> int:  # noqa: D105
         return self._size
+
+    @property
+    def num_valid(self) -> int:
+        """Number of sampleable transitions — ``len()`` minus the compact layout's padding rows."""
+        return self._size - self._num_padding
+
+    @_synchronized
+    def save_chunks(self, directory: str | Path, chunk_size: int = 65_536) -> dict:
+        """Write the buffer to ``directory`` as compressed chunks and return its state.
+
+        Rows are saved in ``chunk_size``-row ``.npz`` files.  Saves are
+        incremental: if ``directory`` holds the previous save, only chunks
+        written to since then are rewritten.  Each chunk is replaced
+        atomically, so a job killed mid-save leaves every file readable.
+
+        The chunk files track the *latest* save — restoring an older
+        checkpoint from the same directory restores the newer contents.
+
+        Args:
+            directory: Where to keep the chunk files.
+            chunk_size: Rows per chunk file.
+
+        Returns:
+            A small dict of plain values and tensors for :meth:`load_chunks`
+            — fill level, pointer, layout and location, but no row data.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        self._write_chunks(directory, chunk_size)
+        self._synced_dir, self._synced_written = directory, self._num_written
+        state = {
+            "format": "chunks", "directory": str(directory), "chunk_size": chunk_size,
+            "ptr": self._ptr, "size": self._size, "num_written": self._num_written,
+            "buffer_size": self._buffer_size, "compact": self.compact, "n_step": self.n_step,
+        }
+        if self.compact:
+            state["pending_next_obs"] = self._pending_next_obs.cpu().clone()
+        return state
+
+    @_synchronized
+    def load_chunks(self, state: dict) -> None:
+        """Restore the contents saved by :meth:`save_chunks`.
+
+        The environments restart after a resume, so the interrupted
+        episodes are closed off: pending n-step transitions are dropped and
+        the compact layout gets the padding block an autoreset would write.
+
+        Args:
+            state: Dict returned by :meth:`save_chunks`.
+
+        Raises:
+            ValueError: If the saved buffer has a different capacity or layout.
+        """
+        saved = (state["buffer_size"], state["compact"], state["n_step"])
+        if saved != (self._buffer_size, self.compact, self.n_step):
+            msg = (
+                f"Saved replay buffer (buffer_size, compact, n_step)={saved} does not match "
+                f"{(self._buffer_size, self.compact, self.n_step)}."
+            )
+            raise ValueError(msg)
+        self._read_chunks(state)
+        self._ptr, self._size, self._num_written = state["ptr"], state["size"], state["num_written"]
+        if state["format"] == "chunks":
+            self._synced_dir, self._synced_written = Path(state["directory"]), self._num_written
+        self._restore_extra(state)
+
+        if self.n_step > 1:
+            self._ring_len[:] = 0
+        if self.compact:
+            self._recount_padding()
+            self._close_pending_block(state["pending_next_obs"].numpy())
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _close_pending_block(self, pending_next_obs: np.ndarray) -> None:
+        """Compact layout: end every env's episode with the padding block an autoreset would write.
+
+        Without it the newest rows would take the next run's first
+        observations as their ``next_obs``.
+        """
+        n = self._num_envs
+        self._write((
+            pending_next_obs, np.zeros((n, self._action_dim)), np.zeros(n), np.zeros(n), np.zeros(n, dtype=bool),
+        ), n=n)
+
+    def _recount_padding(self) -> None:
+        """Compact layout: recount the padding rows after the storage was replaced wholesale."""
+        self._num_padding = self._size - int(self._valid[: self._size].sum())
+
+    def _count_overwritten_padding(self, valid: np.ndarray) -> None:
+        """Compact layout: update the padding count for ``valid`` flags about to be written at the pointer."""
+        idx = (self._ptr + np.arange(len(valid))) % self._buffer_size
+        idx = idx[idx < self._size]
+        if self._host_views is not None:
+            overwritten = self._host_views[-1][idx]
+        else:
+            overwritten = self._valid[torch.from_numpy(idx).to(self.device)].cpu().numpy()
+        self._num_padding += int((~valid).sum()) - int((~overwritten).sum())
+
+    def _write_row(self, values: tuple) -> None:
+        """Write a single row (one value per storage tensor) at the pointer."""
+        if self._host_views is None:
+            self._write(tuple(np.asarray(value)[np.newaxis] for value in values), n=1)
+            return
+        if self.compact:
+            # Scalar form of _count_overwritten_padding; values[-1] is the valid flag
+            overwritten_padding = self._ptr < self._size and not self._host_views[-1][self._ptr]
+            self._num_padding += (not values[-1]) - overwritten_padding
+        for view, value in zip(self._host_views, values):
+            view[self._ptr] = value
+        self._ptr = (self._ptr + 1) % self._buffer_size
+        self._size = min(self._size + 1, self._buffer_size)
+        self._num_written += 1
+
+    def _write(self, values: tuple, n: int) -> None:
+        """Write ``n`` rows (one value per storage tensor) at the pointer, wrapping at the end."""
+        if self.compact:
+            self._count_overwritten_padding(np.asarray(values[-1], dtype=bool).reshape(n))
+        head = min(n, self._buffer_size - self._ptr)
+        targets = self._host_views if self._host_views is not None else self._storage()
+        for storage, value in zip(targets, values):
+            value = np.asarray(value, dtype=storage.dtype if self._host_views is not None else None)
+            value = value.reshape(n, *storage.shape[1:])
+            if self._host_views is None:
+                value = torch.from_numpy(value).to(storage.dtype)
+            storage[self._ptr: self._ptr + head] = value[:head]
+            storage[: n - head] = value[head:]
+
+        self._ptr = (self._ptr + n) % self._buffer_size
+        self._size = min(self._size + n, self._buffer_size)
+        self._num_written += n
+
+    def _dirty_chunks(self, directory: Path, chunk_size: int) -> list[int]:
+        """Indices of the chunks that differ from the copy in ``directory``."""
+        num_filled = math.ceil(self._size / chunk_size)
+        new_rows = self._num_written - self._synced_written
+        if directory != self._synced_dir or new_rows >= self._buffer_size:
+            return list(range(num_filled))
+        if new_rows == 0:
+            return []
+        first = (self._ptr - new_rows) % self._buffer_size
+        last = first + new_rows - 1
+        if last < self._buffer_size:
+            return list(range(first // chunk_size, last // chunk_size + 1))
+        # The changed rows wrap past the end of the buffer
+        return list(range(first // chunk_size, num_filled)) + list(
+            range((last - self._buffer_size) // chunk_size + 1)
+        )
+
+    def _write_chunks(self, directory: Path, chunk_size: int) -> None:
+        """Save the dirty chunks as compressed ``.npz`` files (tmp file + atomic rename)."""
+        storage = self._named_storage()
+        for k in self._dirty_chunks(directory, chunk_size):
+            rows = slice(k * chunk_size, min((k + 1) * chunk_size, self._size))
+            path = directory / _CHUNK_FILE.format(k)
+            tmp = path.with_suffix(".tmp.npz")
+            np.savez_compressed(tmp, **{name: t[rows].cpu().numpy() for name, t in storage.items()})
+            os.replace(tmp, path)
+
+    def _read_chunks(self, state: dict) -> None:
+        """Copy saved rows into storage, from chunk files or a memmap buffer's ``.npy`` files."""
+        directory = Path(state["directory"])
+        storage = self._named_storage()
+        chunk_size = state["chunk_size"]
+        if state["format"] == "memmap":
+            for name, tensor in storage.items():
+                saved = np.load(directory / f"{name}.npy", mmap_mode="r")
+                for lo in range(0, state["size"], chunk_size):
+                    hi = min(lo + chunk_size, state["size"])
+                    tensor[lo:hi] = torch.from_numpy(np.ascontiguousarray(saved[lo:hi]))
+            return
+        for k in range(math.ceil(state["size"] / chunk_size)):
+            with np.load(directory / _CHUNK_FILE.format(k)) as chunk:
+                for name, tensor in storage.items():
+                    rows = torch.from_numpy(chunk[name])
+                    tensor[k * chunk_size: k * chunk_size + len(rows)] = rows
+
+    def _restore_extra(self, state: dict) -> None:
+        """Hook for subclasses to restore extra state saved alongside the rows."""
+
+    def _push_n_step(
+        self,
+        obs: np.ndarray,
+        action: np.ndarray,
+        reward: np.ndarray,
+        next_obs: np.ndarray,
+        terminated: np.ndarray,
+        ended: np.ndarray,
+        valid: np.ndarray,
+    ) -> None:
+        """Append one step per env to the n-step rings and write the transitions it completes."""
+        n = self.n_step
+        envs = np.flatnonzero(valid)
+        slot = self._ring_len[envs]
+        self._ring_obs[envs, slot] = np.asarray(obs)[envs]
+        self._ring_action[envs, slot] = np.asarray(action).reshape(len(valid), -1)[envs]
+        self._ring_reward[envs, slot] = np.asarray(reward)[envs]
+        self._ring_len[envs] += 1
+        next_obs = np.asarray(next_obs, dtype=np.float32)
+
+        rows = []
+        full = valid & ~ended & (self._ring_len == n)
+        if full.any():
+            # Oldest pending transition has its n rewards — emit it and shift the ring
+            k = int(full.sum())
+            rows.append((
+                self._ring_obs[full, 0], self._ring_action[full, 0],
+                self._ring_reward[full] @ self._return_weights[0], next_obs[full],
+                np.zeros(k), np.full(k, self.gamma ** n),
+            ))
+            for ring in (self._ring_obs, self._ring_action, self._ring_reward):
+                ring[full, :-1] = ring[full, 1:]
+            self._ring_len[full] -= 1
+
+        flush = valid & ended
+        if flush.any():
+            # Episode over — every pending transition bootstraps from the final obs
+            m = self._ring_len[flush]
+            pending = np.arange(n)[np.newaxis] < m[:, np.newaxis]
+            returns = np.where(pending, self._ring_reward[flush], 0.0) @ self._return_weights.T
+            horizon = m[:, np.newaxis] - np.arange(n)[np.newaxis]
+            rows.append((
+                self._ring_obs[flush][pending], self._ring_action[flush][pending], returns[pending],
+                np.repeat(next_obs[flush], m, axis=0), np.repeat(terminated[flush], m).astype(np.float32),
+                (self.gamma ** horizon)[pending],
+            ))
+            self._ring_len[flush] = 0
+
+        if rows:
+            values = tuple(np.concatenate(field) for field in zip(*rows))
+            self._write(values, n=len(values[2]))
+
+    def _next_obs_rows(self, idx: torch.Tensor, out: torch.Tensor | None) -> torch.Tensor:
+        """Compact layout: reconstruct ``next_obs`` for rows ``idx``."""
+        n = self._num_envs
+        next_obs = torch.index_select(self._obs, 0, (idx + n) % self._buffer_size, out=out)
+        # Rows of the newest block have no successor yet — use the held-aside next_obs
+        age = (self._ptr - 1 - idx) % self._buffer_size
+        newest = age < n
+        if newest.any():
+            next_obs[newest] = self._pending_next_obs[n - 1 - age[newest]]
+        return next_obs
+
+    def _gather(self, idx: torch.Tensor, device: torch.device | str | None) -> Batch:
+        """Gather rows ``idx`` of every field into a :class:`Batch` on ``device``."""
+        device = self.device if device is None else torch.device(device)
+        staged = self.pin_memory and device.type != "cpu"
+        n = len(idx)
+        if staged:
+            if n not in self._staging:
+                obs_shape, action_shape = self._obs.shape[1:], self._action.shape[1:]
+                self._staging[n] = Batch(*(
+                    torch.empty(n, *shape, pin_memory=True)
+                    for shape in (obs_shape, action_shape, (), obs_shape, ())
+                ))
+                if self._discount is not None:
+                    self._staging[n].discount = torch.empty(n, pin_memory=True)
+            elif n in self._staging_events:
+                # The previous non-blocking copy must finish before the staging batch is overwritten
+                self._staging_events[n].synchronize()
+
+        def out(name: str) -> torch.Tensor | None:
+            return getattr(self._staging[n], name) if staged else None
+
+        if self.compact:
+            next_obs = self._next_obs_rows(idx, out("next_obs"))
+        else:
+            next_obs = torch.index_select(self._next_obs, 0, idx, out=out("next_obs"))
+        batch = Batch(
+            obs=torch.index_select(self._obs, 0, idx, out=out("obs")),
+            action=torch.index_select(self._action, 0, idx, out=out("action")),
+            reward=torch.index_select(self._reward, 0, idx, out=out("reward")),
+            next_obs=next_obs,
+            done=torch.index_select(self._done, 0, idx, out=out("done")),
+        )
+        if self._discount is not None:
+            batch.discount = torch.index_select(self._discount, 0, idx, out=out("discount"))
+        if not staged:
+            return batch.to(device)
+        batch = batch.to(device, non_blocking=True)
+        self._staging_events[n] = torch.cuda.Event()
+        self._staging_events[n].record()
+        return batch
@@ -8,6 +8,8 @@ import torch
 import lightning as L
 from torch.utils.data import DataLoader, TensorDataset
 
+from .vector_env import make_vector_env
+
 
 def _make_env(env_id: str, seed: int):
     def thunk():
@@ -21,7 +23,9 @@ def _make_env(env_id: str, seed: int):
 class RolloutDataModule(L.LightningDataModule):
     """Vectorized environment datamodule for on-policy algorithms (PPO/RPO).
 
-    Creates a ``SyncVectorEnv`` with ``num_envs`` parallel environments.
+    Creates a vector env with ``num_envs`` parallel environments, stepped
+    either in-process (``SyncVectorEnv``) or in worker processes
+    (``AsyncVectorEnv``) depending on ``vector_backend``.
     Exposes ``obs_shape``, ``act_shape``, and ``is_continuous`` so
     ``PPOModule.setup()`` can pre-allocate rollout buffers.
 
@@ -32,16 +36,30 @@ class RolloutDataModule(L.LightningDataModule):
         env_id: Gymnasium environment ID (e.g. ``"CartPole-v1"``).
         num_envs: Number of parallel environments.
         seed: Base random seed; env ``i`` gets ``seed + i``.
+        vector_backend: ``"sync"``, ``"async"`` (one process per env) or
+            ``"shared_memory"`` (async with shared-memory observations).
+            Use an async backend when env stepping, not the network, is
+            the bottleneck.
+        async_context: Multiprocessing start method for async backends
+            (``"fork"``, ``"spawn"``, ``"forkserver"``); ``None`` uses the
+            platform default.
     """
 
     # Accumulated episode stats (mirroring RLDataModule interface)
     episode_rewards: list[float]
     episode_lengths: list[int]
 
-    def __init__(self, env_id: str, num_envs: int = 4, seed: int = 42) -> None:
+    def __init__(
+        self,
+        env_id: str,
+        num_envs: int = 4,
+        seed: int = 42,
+        vector_backend: str = "sync",
+        async_context: str | None = None,
+    ) -> None:
         super().__init__()
         self.save_hyperparameters()
-        self.envs: gym.vector.SyncVectorEnv | None = None
+        self.envs: gym.vector.VectorEnv | None = None
 
         self.episode_rewards: list[float] = []
         self.episode_lengths: list[int] = []
@@ -56,9 +74,13 @@ class RolloutDataModule(L.LightningDataModule):
             return
 
         hp = self.hparams
-        self.envs = gym.vector.SyncVectorEnv(
-            [_make_env(hp.env_id, hp.seed + i) for i in range(hp.num_envs)]
+        self.envs = make_vector_env(
+            [_make_env(hp.env_id, hp.seed + i) for i in range(hp.num_envs)],
+            backend=hp.vector_backend,
+            context=hp.async_context,
         )
+        # Seed every sub-env's RNG once (env i ← seed + i); later resets continue these streams
+        self.envs.reset(seed=[hp.seed + i for i in range(hp.num_envs)])
 
         self.obs_shape = self.envs.single_observation_space.shape
         act_space = self.envs.single_action_space
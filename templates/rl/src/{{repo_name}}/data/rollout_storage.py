@@ -0,0 +1,137 @@
+"""Preallocated on-policy rollout storage for PPO/RPO.
+
+:class:`RolloutStorage` owns the ``(num_steps, num_envs, ...)`` tensors that
+a PPO round fills during collection and consumes during the update.  The
+tensors live on the learner's device, so per-step writes are in-place device
+copies and the update receives zero-copy flattened views instead of two full
+host↔device buffer copies per round.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import torch
+
+
+class RolloutStorage:
+    """Fixed-size rollout buffer written in place, one timestep at a time.
+
+    Shapes (``T = num_steps``, ``N = num_envs``):
+
+    - ``obs``:       ``(T, N, *obs_shape)``
+    - ``actions``:   ``(T, N, *act_shape)``
+    - ``log_probs``, ``rewards``, ``dones``, ``values``: ``(T, N)``
+
+    ``dones[t]`` flags that the episode ended on step ``t - 1`` (CleanRL
+    convention), so GAE reads ``dones[t + 1]`` as the terminal mask of step
+    ``t``.  Gymnasium vector envs autoreset on the *next* step, so step
+    ``t`` then only resets its env: ``obs[t]`` is the final observation,
+    the action is ignored and the reward is 0.  :meth:`flatten` drops those
+    steps from the update.
+
+    Args:
+        num_steps: Rollout length per environment.
+        num_envs: Number of parallel environments.
+        obs_shape: Single-environment observation shape.
+        act_shape: Single-environment action shape (``()`` for discrete).
+        device: Device the learner runs on.
+        pin_memory: Keep the tensors in pinned host memory instead of on
+            ``device``.  Saves accelerator memory for large rollouts; writes
+            and :meth:`flatten` then use non-blocking copies.  Ignored when
+            CUDA is unavailable.
+    """
+
+    def __init__(
+        self,
+        num_steps: int,
+        num_envs: int,
+        obs_shape: tuple[int, ...],
+        act_shape: tuple[int, ...],
+        device: torch.device | str = "cpu",
+        pin_memory: bool = False,
+    ) -> None:
+        self.num_steps = num_steps
+        self.num_envs = num_envs
+        self.device = torch.device(device)
+        self.pin_memory = pin_memory and torch.cuda.is_available()
+
+        storage_device = torch.device("cpu") if self.pin_memory else self.device
+        alloc = {"device": storage_device, "pin_memory": self.pin_memory}
+        self.obs = torch.zeros(num_steps, num_envs, *obs_shape, **alloc)
+        self.actions = torch.zeros(num_steps, num_envs, *act_shape, **alloc)
+        self.log_probs = torch.zeros(num_steps, num_envs, **alloc)
+        self.rewards = torch.zeros(num_steps, num_envs, **alloc)
+        self.dones = torch.zeros(num_steps, num_envs, **alloc)
+        self.values = torch.zeros(num_steps, num_envs, **alloc)
+
+        # Observation after the last step and its episode-start flag, on the
+        # learner's device — set by the collector, read by GAE for bootstrapping
+        self.next_obs: torch.Tensor | None = None
+        self.next_done: torch.Tensor | None = None
+
+    def insert(
+        self,
+        step: int,
+        obs: torch.Tensor,
+        done: torch.Tensor,
+        action: torch.Tensor,
+        log_prob: torch.Tensor,
+        value: torch.Tensor,
+        reward: np.ndarray,
+    ) -> None:
+        """Write one timestep for all envs.
+
+        Device tensors are copied without a host sync; ``reward`` (the
+        numpy array returned by ``envs.step``) is the only host→device copy.
+
+        Args:
+            step: Timestep index in ``[0, num_steps)``.
+            obs: ``(N, *obs_shape)`` observation the action was taken in.
+            done: ``(N,)`` episode-start flags for ``obs``.
+            action: ``(N, *act_shape)`` sampled action.
+            log_prob: ``(N,)`` log-probability of ``action``.
+            value: ``(N,)`` critic estimate for ``obs``.
+            reward: ``(N,)`` reward returned by the environment.
+        """
+        self.obs[step].copy_(obs, non_blocking=True)
+        self.dones[step].copy_(done, non_blocking=True)
+        self.actions[step].copy_(action, non_blocking=True)
+        self.log_probs[step].copy_(log_prob, non_blocking=True)
+        self.values[step].copy_(value, non_blocking=True)
+        self.rewards[step].copy_(torch.from_numpy(np.asarray(reward, dtype=np.float32)), non_blocking=True)
+
+    def on_device(self, name: str) -> torch.Tensor:
+        """Return the ``(T, N, ...)`` tensor ``name`` on the learner's device.
+
+        A no-op in device-resident mode; one non-blocking copy when pinned.
+        """
+        tensor = getattr(self, name)
+        return tensor.to(self.device, non_blocking=True)
+
+    def flatten(self, advantages: torch.Tensor, returns: torch.Tensor) -> dict[str, torch.Tensor]:
+        """Return the rollout's real transitions as ``(B, ...)`` tensors for the update epochs.
+
+        Autoreset steps (``dones[t] == 1``) are not transitions and are left
+        out, so ``B`` is ``T*N`` minus their number.  Without any, every
+        tensor is a zero-copy view; otherwise the kept rows are gathered
+        with one host sync to count them.
+
+        Args:
+            advantages: ``(T, N)`` GAE advantages.
+            returns: ``(T, N)`` bootstrapped returns.
+        """
+        batch_size = self.num_steps * self.num_envs
+        obs = self.on_device("obs")
+        actions = self.on_device("actions")
+        flat = {
+            "obs": obs.reshape(batch_size, *obs.shape[2:]),
+            "actions": actions.reshape(batch_size, *actions.shape[2:]),
+            "log_probs": self.on_device("log_probs").reshape(batch_size),
+            "advantages": advantages.reshape(batch_size),
+            "returns": returns.reshape(batch_size),
+            "values": self.on_device("values").reshape(batch_size),
+        }
+        keep = torch.nonzero(self.on_device("dones").reshape(batch_size) == 0).squeeze(1)
+        if len(keep) == batch_size:
+            return flat
+        return {name: tensor.index_select(0, keep) for name, tensor in flat.items()}
@@ -0,0 +1,34 @@
+"""Vector-env construction shared by the datamodules and the evaluation callback."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+
+import gymnasium as gym
+
+VECTOR_BACKENDS = ("sync", "async", "shared_memory")
+
+
+def make_vector_env(
+    env_fns: Sequence[Callable[[], gym.Env]], backend: str, context: str | None = None
+) -> gym.vector.VectorEnv:
+    """Build the vector env for ``backend``.
+
+    - ``"sync"``: all envs step serially in the trainer process.
+    - ``"async"``: one worker process per env; observations travel through pipes.
+    - ``"shared_memory"``: like ``"async"`` but workers write observations
+      straight into a shared-memory block, avoiding a pickle per step.
+
+    Args:
+        env_fns: One picklable factory per env (async workers receive them
+            by pickle, so avoid lambdas that close over large objects).
+        backend: One of :data:`VECTOR_BACKENDS`.
+        context: Multiprocessing start method for the async backends
+            (``None`` uses the platform default).
+    """
+    if backend == "sync":
+        return gym.vector.SyncVectorEnv(env_fns)
+    if backend in ("async", "shared_memory"):
+        return gym.vector.AsyncVectorEnv(env_fns, shared_memory=backend == "shared_memory", context=context)
+    msg = f"Unknown vector_backend '{backend}', expected one of {VECTOR_BACKENDS}."
+    raise ValueError(msg)
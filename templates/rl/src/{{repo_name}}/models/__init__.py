@@ -1,5 +1,7 @@
 """Neural network architectures for RL agents."""
 
+from .actor_critic import ActorCritic
 from .mlp import MLP
+from .q_network import DuelingQNetwork
 
-__all__ = ["MLP"]
+__all__ = ["ActorCritic", "DuelingQNetwork", "MLP"]
@@ -19,6 +19,7 @@ class StochasticActor(nn.Module):
         action_dim: Action dimensionality.
         hidden_dim: Hidden layer width passed to the backbone MLP.
         num_layers: Number of hidden layers in the backbone MLP.
+        normalize_obs: Normalise observations on-device with running statistics.
     """
 
     def __init__(
@@ -27,9 +28,10 @@ class StochasticActor(nn.Module):
         action_dim: int,
         hidden_dim: int = 256,
         num_layers: int = 2,
+        normalize_obs: bool = False,
     ) -> None:
         super().__init__()
-        self.backbone = MLP(obs_dim, hidden_dim, hidden_dim, num_layers)
+        self.backbone = MLP(obs_dim, hidden_dim, hidden_dim, num_layers, normalize_input=normalize_obs)
         self.mean_head = nn.Linear(hidden_dim, action_dim)
         self.log_std_head = nn.Linear(hidden_dim, action_dim)
 
@@ -51,6 +53,7 @@ class DeterministicActor(MLP):
         action_dim: Action dimensionality.
         hidden_dim: Hidden layer width.
         num_layers: Number of hidden layers.
+        normalize_obs: Normalise observations on-device with running statistics.
     """
 
     def __init__(
@@ -59,5 +62,6 @@ class DeterministicActor(MLP):
         action_dim: int,
         hidden_dim: int = 256,
         num_layers: int = 2,
+        normalize_obs: bool = False,
     ) -> None:
-        super().__init__(obs_dim, action_dim, hidden_dim, num_layers)
+        super().__init__(obs_dim, action_dim, hidden_dim, num_layers, normalize_input=normalize_obs)
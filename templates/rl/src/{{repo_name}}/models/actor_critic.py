@@ -0,0 +1,87 @@
+"""Actor-critic network for PPO/RPO with an optional shared trunk."""
+
+from __future__ import annotations
+
+import math
+
+import torch
+import torch.nn as nn
+
+from ..modules.normalizers import ObsNormalizer
+from .mlp import MLP
+
+
+class ActorCritic(nn.Module):
+    """Policy and value networks evaluated in a single forward pass.
+
+    Architecture (``S = shared_layers``, ``L = num_layers``)::
+
+        trunk:  [Linear + Act] × S                       (identity when S = 0)
+        actor:  [Linear + Act] × (L - S) → Linear(→ action_dim)
+        critic: [Linear + Act] × (L - S) → Linear(→ 1)
+
+    With ``shared_layers=0`` this is exactly the two independent MLPs of the
+    CleanRL baseline.  Every shared layer is computed once for both heads,
+    so ``shared_layers=num_layers`` (linear heads on a common trunk) halves
+    the hidden-layer cost of a forward pass.
+
+    ``forward`` returns ``(actor_out, value)`` — logits (discrete) or action
+    means (continuous), and a ``(B, 1)`` value estimate.
+
+    Args:
+        obs_dim: Observation dimensionality.
+        action_dim: Number of actions (discrete) or action dimensionality.
+        hidden_dim: Width of every hidden layer.
+        num_layers: Hidden layers between the observation and each output.
+        shared_layers: How many of the ``num_layers`` are shared by both heads.
+        activation: Hidden-layer activation (see :class:`MLP`).
+        orthogonal_init: Orthogonal weight init (CleanRL PPO convention).
+        actor_std: Orthogonal init gain of the policy output layer.
+        critic_std: Orthogonal init gain of the value output layer.
+        normalize_obs: Normalise observations on-device with running
+            statistics before the trunk.
+    """
+
+    def __init__(
+        self,
+        obs_dim: int,
+        action_dim: int,
+        hidden_dim: int = 64,
+        num_layers: int = 2,
+        shared_layers: int = 0,
+        activation: str = "tanh",
+        orthogonal_init: bool = True,
+        actor_std: float = 0.01,
+        critic_std: float = 1.0,
+        normalize_obs: bool = False,
+    ) -> None:
+        super().__init__()
+        if not 0 <= shared_layers <= num_layers:
+            msg = f"shared_layers must be in [0, num_layers={num_layers}], got {shared_layers}."
+            raise ValueError(msg)
+
+        self.obs_normalizer: nn.Module = ObsNormalizer(obs_dim) if normalize_obs else nn.Identity()
+        head_dim = obs_dim
+        self.trunk: nn.Module = nn.Identity()
+        if shared_layers > 0:
+            # MLP's output layer plus output_activation forms the last shared hidden block
+            self.trunk = MLP(
+                obs_dim, hidden_dim, hidden_dim, shared_layers - 1, activation,
+                output_activation=activation, orthogonal_init=orthogonal_init, output_std=math.sqrt(2),
+            )
+            head_dim = hidden_dim
+
+        head_layers = num_layers - shared_layers
+        self.actor_head = MLP(
+            head_dim, action_dim, hidden_dim, head_layers, activation,
+            orthogonal_init=orthogonal_init, output_std=actor_std,
+        )
+        self.critic_head = MLP(
+            head_dim, 1, hidden_dim, head_layers, activation,
+            orthogonal_init=orthogonal_init, output_std=critic_std,
+        )
+
+    def forward(self, obs: torch.Tensor) -> tuple[torch.Tensor, torch.Tensor]:
+        """Return ``(actor_out, value)`` from one pass through the trunk."""
+        features = self.trunk(self.obs_normalizer(obs))
+        return self.actor_head(features), self.critic_head(features)
@@ -1,10 +1,19 @@
-"""Twin Q-network (critic) shared by SAC and TD3."""
+"""Q-network critics shared by SAC and TD3.
+
+:class:`TwinCritic` holds two separate MLPs; :class:`EnsembleCritic` stacks
+the weights of ``K`` members into batched tensors so every Q-head is
+evaluated together, one ``baddbmm`` per layer.  Agents read either through
+:func:`stack_q_values`.
+"""
 
 from __future__ import annotations
 
+import math
+
 import torch
 import torch.nn as nn
 
+from ..modules.normalizers import ObsNormalizer
 from .mlp import MLP
 
 
@@ -20,6 +29,8 @@ class TwinCritic(nn.Module):
         action_dim: Dimensionality of the action space.
         hidden_dim: Width of each hidden MLP layer.
         num_layers: Number of hidden layers per Q-network.
+        normalize_obs: Normalise observations (not actions) on-device with
+            running statistics shared by both Q-networks.
     """
 
     def __init__(
@@ -28,8 +39,10 @@ class TwinCritic(nn.Module):
         action_dim: int,
         hidden_dim: int = 256,
         num_layers: int = 2,
+        normalize_obs: bool = False,
     ) -> None:
         super().__init__()
+        self.obs_normalizer: nn.Module = ObsNormalizer(obs_dim) if normalize_obs else nn.Identity()
         self.q1_net = MLP(obs_dim + action_dim, 1, hidden_dim, num_layers)
         self.q2_net = MLP(obs_dim + action_dim, 1, hidden_dim, num_layers)
 
@@ -37,5 +50,85 @@ class TwinCritic(nn.Module):
         self, obs: torch.Tensor, action: torch.Tensor
     ) -> tuple[torch.Tensor, torch.Tensor]:
         """Return ``(q1, q2)`` each of shape ``(B, 1)``."""
-        x = torch.cat([obs, action], dim=-1)
+        x = torch.cat([self.obs_normalizer(obs), action], dim=-1)
         return self.q1_net(x), self.q2_net(x)
+
+
+class EnsembleLinear(nn.Module):
+    """``num_members`` independent linear layers evaluated as one batched matmul.
+
+    ``weight`` is ``(K, in, out)`` and ``bias`` ``(K, 1, out)``; each member
+    is initialised like a fresh ``nn.Linear``.
+
+    Args:
+        num_members: Ensemble size ``K``.
+        in_features: Input dimensionality of every member.
+        out_features: Output dimensionality of every member.
+    """
+
+    def __init__(self, num_members: int, in_features: int, out_features: int) -> None:
+        super().__init__()
+        bound = 1.0 / math.sqrt(in_features)
+        self.weight = nn.Parameter(torch.empty(num_members, in_features, out_features).uniform_(-bound, bound))
+        self.bias = nn.Parameter(torch.empty(num_members, 1, out_features).uniform_(-bound, bound))
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        """Map ``(K, B, in)`` to ``(K, B, out)``; member ``k`` sees ``x[k]``."""
+        return torch.baddbmm(self.bias, x, self.weight)
+
+
+class EnsembleCritic(nn.Module):
+    """``K`` Q-networks with stacked weights, evaluated in a single batched pass.
+
+    Equivalent to ``K`` separate ``MLP(obs_dim + action_dim, 1)`` networks,
+    but each layer runs as one ``baddbmm`` over all members instead of ``K``
+    small matmuls.  ``num_critics=2`` is a drop-in replacement for
+    :class:`TwinCritic`; larger ensembles (REDQ-style, ``K ≥ 10``) cost
+    little more per step as long as the batched matmuls fit the device.
+
+    ``forward`` returns a ``(K, B, 1)`` tensor, so ``q1, q2 = critic(...)``
+    still works when ``K == 2``.
+
+    Args:
+        obs_dim: Dimensionality of the observation space.
+        action_dim: Dimensionality of the action space.
+        hidden_dim: Width of each hidden layer.
+        num_layers: Number of hidden layers per member.
+        num_critics: Ensemble size ``K``.
+        normalize_obs: Normalise observations (not actions) on-device with
+            running statistics shared by all members.
+    """
+
+    def __init__(
+        self,
+        obs_dim: int,
+        action_dim: int,
+        hidden_dim: int = 256,
+        num_layers: int = 2,
+        num_critics: int = 2,
+        normalize_obs: bool = False,
+    ) -> None:
+        super().__init__()
+        if num_critics < 1:
+            msg = f"num_critics must be >= 1, got {num_critics}"
+            raise ValueError(msg)
+        self.num_critics = num_critics
+        self.obs_normalizer: nn.Module = ObsNormalizer(obs_dim) if normalize_obs else nn.Identity()
+        dims = [obs_dim + action_dim] + [hidden_dim] * num_layers + [1]
+        self.layers = nn.ModuleList(EnsembleLinear(num_critics, d_in, d_out) for d_in, d_out in zip(dims, dims[1:]))
+
+    def forward(self, obs: torch.Tensor, action: torch.Tensor) -> torch.Tensor:
+        """Return the ``(K, B, 1)`` Q-values of every member."""
+        x = torch.cat([self.obs_normalizer(obs), action], dim=-1)
+        # Every member sees the same input: broadcast it rather than copy it K times
+        x = x.unsqueeze(0).expand(self.num_critics, *x.shape)
+        for layer in self.layers[:-1]:
+            x = torch.relu(layer(x))
+        return self.layers[-1](x)
+
+
+def stack_q_values(q: torch.Tensor | tuple[torch.Tensor, ...]) -> torch.Tensor:
+    """Return critic output as a ``(K, B)`` tensor, whether it is a tuple of heads or already stacked."""
+    if not isinstance(q, torch.Tensor):
+        q = torch.stack(q)
+    return q.squeeze(-1)
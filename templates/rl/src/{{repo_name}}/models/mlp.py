@@ -7,6 +7,8 @@ import math
 import torch
 import torch.nn as nn
 
+from ..modules.normalizers import ObsNormalizer
+
 _ACTIVATIONS: dict[str, type[nn.Module]] = {
     "relu": nn.ReLU,
     "tanh": nn.Tanh,
@@ -35,6 +37,8 @@ class MLP(nn.Module):
         hidden_std: Orthogonal init gain for hidden layers (default √2).
         output_std: Orthogonal init gain for the output layer; override to
             e.g. 0.01 for policy heads.
+        normalize_input: Prepend an ``ObsNormalizer`` (see ``modules.normalizers``)
+            so inputs are normalised on-device with running statistics.
     """
 
     def __init__(
@@ -48,8 +52,10 @@ class MLP(nn.Module):
         orthogonal_init: bool = False,
         hidden_std: float = math.sqrt(2),
         output_std: float = 1.0,
+        normalize_input: bool = False,
     ) -> None:
         super().__init__()
+        self.input_normalizer: nn.Module = ObsNormalizer(input_dim) if normalize_input else nn.Identity()
         act_cls = _ACTIVATIONS[activation]
 
         layers: list[nn.Module] = []
@@ -75,4 +81,4 @@ class MLP(nn.Module):
         self.net = nn.Sequential(*layers)
 
     def forward(self, x: torch.Tensor) -> torch.Tensor:
-        return self.net(x)
+        return self.net(self.input_normalizer(x))
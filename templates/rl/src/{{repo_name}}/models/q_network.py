@@ -0,0 +1,59 @@
+"""Dueling Q-network for DQN."""
+
+from __future__ import annotations
+
+import torch
+import torch.nn as nn
+
+from .mlp import MLP
+
+
+class DuelingQNetwork(nn.Module):
+    """Q-network that splits into state-value and advantage streams (Wang et al., 2016).
+
+    Architecture::
+
+        trunk:     [Linear + ReLU] × num_layers
+        value:     Linear(→ 1)
+        advantage: Linear(→ output_dim)
+        Q(s, a) = V(s) + A(s, a) - mean_a' A(s, a')
+
+    Takes the same arguments as the :class:`MLP` it replaces in the DQN
+    config, so switching is a change of ``_target_``.
+
+    Args:
+        input_dim: Observation dimensionality.
+        output_dim: Number of discrete actions.
+        hidden_dim: Width of every hidden layer.
+        num_layers: Hidden layers in the shared trunk (at least 1).
+        activation: Hidden-layer activation (see :class:`MLP`).
+        normalize_input: Normalise observations on-device with running
+            statistics before the trunk.
+    """
+
+    def __init__(
+        self,
+        input_dim: int,
+        output_dim: int,
+        hidden_dim: int = 128,
+        num_layers: int = 2,
+        activation: str = "relu",
+        normalize_input: bool = False,
+    ) -> None:
+        super().__init__()
+        if num_layers < 1:
+            msg = f"num_layers must be >= 1, got {num_layers}."
+            raise ValueError(msg)
+        # MLP's output layer plus output_activation forms the last trunk block
+        self.trunk = MLP(
+            input_dim, hidden_dim, hidden_dim, num_layers - 1, activation,
+            output_activation=activation, normalize_input=normalize_input,
+        )
+        self.value_head = nn.Linear(hidden_dim, 1)
+        self.advantage_head = nn.Linear(hidden_dim, output_dim)
+
+    def forward(self, obs: torch.Tensor) -> torch.Tensor:
+        """Return ``(B, output_dim)`` Q-values."""
+        h = self.trunk(obs)
+        advantage = self.advantage_head(h)
+        return self.value_head(h) + advantage - advantage.mean(dim=-1, keepdim=True)
@@ -0,0 +1,159 @@
+"""Generalized Advantage Estimation (GAE) engines for on-policy algorithms.
+
+GAE is a reverse-time linear recurrence over a ``(T, N)`` rollout::
+
+    nnt_t   = 1 - done_{t+1}                    (next_done for t = T-1)
+    delta_t = r_t + γ · V_{t+1} · nnt_t - V_t    (next_value for t = T-1)
+    A_t     = delta_t + γλ · nnt_t · A_{t+1}
+
+Three interchangeable engines are provided, selected by name via
+:func:`get_gae_engine`:
+
+- ``"loop"`` — reference Python loop over ``T`` (CleanRL formulation).
+- ``"scan"`` — log-depth backward scan (discounted cumulative sum with a
+  per-step discount) batched over all envs: ``ceil(log2 T)`` tensor ops
+  instead of ``T``.
+- ``"compiled"`` — ``torch.compile`` of the scan; falls back to ``"scan"``
+  when compilation is unavailable (e.g. no C++ toolchain).
+
+All engines share the signature::
+
+    advantages, returns = engine(rewards, values, dones, next_value, next_done, gamma, gae_lambda)
+
+with ``rewards``/``values``/``dones`` of shape ``(T, N)`` and
+``next_value``/``next_done`` of shape ``(N,)``.
+"""
+
+from __future__ import annotations
+
+import warnings
+from typing import Callable
+
+import torch
+
+GAEEngine = Callable[..., tuple[torch.Tensor, torch.Tensor]]
+
+
+def _shifted_inputs(
+    values: torch.Tensor,
+    dones: torch.Tensor,
+    next_value: torch.Tensor,
+    next_done: torch.Tensor,
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """Return ``(V_{t+1}, nnt_t)`` aligned with step ``t``, both ``(T, N)``."""
+    next_values = torch.cat([values[1:], next_value.unsqueeze(0)], dim=0)
+    next_non_terminal = 1.0 - torch.cat([dones[1:], next_done.unsqueeze(0)], dim=0).float()
+    return next_values, next_non_terminal
+
+
+def gae_loop(
+    rewards: torch.Tensor,
+    values: torch.Tensor,
+    dones: torch.Tensor,
+    next_value: torch.Tensor,
+    next_done: torch.Tensor,
+    gamma: float,
+    gae_lambda: float,
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """Reference GAE: one Python iteration per timestep.
+
+    Returns:
+        ``(advantages, returns)`` each of shape ``(T, N)``.
+    """
+    num_steps = rewards.shape[0]
+    advantages = torch.zeros_like(rewards)
+    last_gae = 0.0
+    for t in reversed(range(num_steps)):
+        next_non_terminal = 1.0 - (next_done if t == num_steps - 1 else dones[t + 1]).float()
+        next_vals = next_value if t == num_steps - 1 else values[t + 1]
+        delta = rewards[t] + gamma * next_vals * next_non_terminal - values[t]
+        last_gae = delta + gamma * gae_lambda * next_non_terminal * last_gae
+        advantages[t] = last_gae
+    return advantages, advantages + values
+
+
+def gae_scan(
+    rewards: torch.Tensor,
+    values: torch.Tensor,
+    dones: torch.Tensor,
+    next_value: torch.Tensor,
+    next_done: torch.Tensor,
+    gamma: float,
+    gae_lambda: float,
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """Log-depth backward scan over all environments at once.
+
+    GAE is the affine recurrence ``A_t = delta_t + c_t · A_{t+1}`` with
+    ``c_t = γλ · nnt_t``.  Composing two steps gives another affine step::
+
+        A_t = (delta_t + c_t · delta_{t+k}) + (c_t · c_{t+k}) · A_{t+2k}
+
+    so doubling the stride ``k = 1, 2, 4, ...`` (Hillis–Steele) resolves the
+    full discounted sum in ``ceil(log2 T)`` whole-tensor updates instead of
+    ``T`` per-timestep ones.
+
+    Returns:
+        ``(advantages, returns)`` each of shape ``(T, N)``.
+    """
+    num_steps = rewards.shape[0]
+    next_values, next_non_terminal = _shifted_inputs(values, dones, next_value, next_done)
+    advantages = rewards + gamma * next_values * next_non_terminal - values
+    coefs = gamma * gae_lambda * next_non_terminal
+
+    stride = 1
+    while stride < num_steps:
+        # Right-hand sides are materialised before writing, so the overlapping slices are safe
+        advantages[:-stride] += coefs[:-stride] * advantages[stride:]
+        coefs[:-stride] = coefs[:-stride] * coefs[stride:]
+        stride *= 2
+    return advantages, advantages + values
+
+
+_compiled_scan: GAEEngine | None = None
+
+
+def gae_compiled(
+    rewards: torch.Tensor,
+    values: torch.Tensor,
+    dones: torch.Tensor,
+    next_value: torch.Tensor,
+    next_done: torch.Tensor,
+    gamma: float,
+    gae_lambda: float,
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """``torch.compile``-d :func:`gae_scan`, with an eager fallback.
+
+    Compilation happens lazily on the first call.  If it fails the error is
+    reported once as a warning and every later call uses :func:`gae_scan`.
+
+    Returns:
+        ``(advantages, returns)`` each of shape ``(T, N)``.
+    """
+    global _compiled_scan
+    args = (rewards, values, dones, next_value, next_done, gamma, gae_lambda)
+    if _compiled_scan is None:
+        try:
+            compiled = torch.compile(gae_scan, dynamic=True)
+            result = compiled(*args)
+        except Exception as exc:
+            warnings.warn(f"gae_compiled: torch.compile unavailable, using eager scan ({exc})", stacklevel=2)
+            _compiled_scan = gae_scan
+            return gae_scan(*args)
+        _compiled_scan = compiled
+        return result
+    return _compiled_scan(*args)
+
+
+_GAE_ENGINES: dict[str, GAEEngine] = {
+    "loop": gae_loop,
+    "scan": gae_scan,
+    "compiled": gae_compiled,
+}
+
+
+def get_gae_engine(name: str) -> GAEEngine:
+    """Look up a GAE engine by name (``"loop"``, ``"scan"`` or ``"compiled"``)."""
+    if name not in _GAE_ENGINES:
+        msg = f"Unknown GAE engine '{name}', expected one of {sorted(_GAE_ENGINES)}."
+        raise ValueError(msg)
+    return _GAE_ENGINES[name]
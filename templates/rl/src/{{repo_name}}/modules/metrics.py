@@ -0,0 +1,41 @@
+"""On-device metric accumulation for agents that run many updates per ``training_step``.
+
+Calling ``self.log`` after every gradient step costs a trip through
+Lightning's logging machinery each time.  Agents instead add each step's
+losses to a :class:`MetricAccumulator` — in-place tensor adds on the
+losses' device, no host synchronisation — and log the means once per
+``training_step``:
+
+.. code-block:: python
+
+    metrics = MetricAccumulator()
+    for ...:
+        metrics.add("train/critic_loss", critic_loss)
+    self.log_dict(metrics.means(), on_step=True)
+"""
+
+from __future__ import annotations
+
+import torch
+
+
+class MetricAccumulator:
+    """Running means of scalar tensors, kept on their device until read."""
+
+    def __init__(self) -> None:
+        self._sums: dict[str, torch.Tensor] = {}
+        self._counts: dict[str, int] = {}
+
+    def add(self, name: str, value: torch.Tensor) -> None:
+        """Add one (detached) observation of ``name``."""
+        value = value.detach()
+        if name in self._sums:
+            self._sums[name] += value
+            self._counts[name] += 1
+        else:
+            self._sums[name] = value.clone()
+            self._counts[name] = 1
+
+    def means(self) -> dict[str, torch.Tensor]:
+        """Mean of every metric added so far (empty if nothing was added)."""
+        return {name: total / self._counts[name] for name, total in self._sums.items()}
@@ -0,0 +1,70 @@
+"""Target-network updates shared by the off-policy agents.
+
+Both helpers batch every tensor of a network into a single multi-tensor
+(``torch._foreach_*``) call instead of looping over parameters in Python,
+so an update costs a handful of kernel launches however many layers the
+network has — this matters at high update-to-data ratios, where targets
+are refreshed after every gradient step.
+
+.. code-block:: python
+
+    soft_update(self.critic_target, self.critic, tau=0.005)  # Polyak averaging
+    hard_update(self.q_target, self.q_network)                # periodic copy
+"""
+
+from __future__ import annotations
+
+import torch
+import torch.nn as nn
+
+
+def _paired_tensors(
+    target: nn.Module, online: nn.Module, buffers: bool
+) -> tuple[list[torch.Tensor], list[torch.Tensor]]:
+    target_tensors = list(target.parameters())
+    online_tensors = list(online.parameters())
+    if buffers:
+        target_tensors += list(target.buffers())
+        online_tensors += list(online.buffers())
+    if len(target_tensors) != len(online_tensors):
+        msg = f"target and online networks differ: {len(target_tensors)} vs {len(online_tensors)} tensors"
+        raise ValueError(msg)
+    return target_tensors, online_tensors
+
+
+@torch.no_grad()
+def soft_update(target: nn.Module, online: nn.Module, tau: float) -> None:
+    """Polyak-average ``online`` into ``target``: ``θ_target ← (1 - τ)·θ_target + τ·θ_online``.
+
+    Only parameters are averaged.  Buffers such as
+    :class:`~.normalizers.ObsNormalizer` statistics are left alone: agents
+    feed the same observations to the online and target copies, so those
+    already match.  ``tau=1`` is a :func:`hard_update`.
+
+    Args:
+        target: Network to update in place.
+        online: Network with identical architecture to read from.
+        tau: Interpolation coefficient in ``(0, 1]``.
+    """
+    if tau >= 1.0:
+        hard_update(target, online)
+        return
+    target_params, online_params = _paired_tensors(target, online, buffers=False)
+    torch._foreach_lerp_(target_params, online_params, tau)
+
+
+@torch.no_grad()
+def hard_update(target: nn.Module, online: nn.Module) -> None:
+    """Copy every parameter and buffer of ``online`` into ``target``.
+
+    Args:
+        target: Network to overwrite in place.
+        online: Network with identical architecture to read from.
+    """
+    target_tensors, online_tensors = _paired_tensors(target, online, buffers=True)
+    if hasattr(torch, "_foreach_copy_"):
+        torch._foreach_copy_(target_tensors, online_tensors)
+    else:
+        # torch < 2.1
+        for t, o in zip(target_tensors, online_tensors):
+            t.copy_(o)
@@ -5,12 +5,13 @@ from __future__ import annotations
 from pathlib import Path
 
 import pytest
+import torch
 from hydra import compose, initialize_config_dir
 from hydra.core.global_hydra import GlobalHydra
 from hydra.utils import instantiate
 
 
-def _fit(overrides: list[str], tmp_path) -> None:
+def _fit(overrides: list[str], tmp_path):
     GlobalHydra.instance().clear()
     config_dir = str(Path(__file__).parent.parent / "configs")
     with initialize_config_dir(config_dir=config_dir, version_base=None):
@@ -23,7 +24,8 @@ def _fit(overrides: list[str], tmp_path) -> None:
         else []
     )
     trainer = instantiate(cfg.trainer, logger=False, callbacks=callbacks)
-    trainer.fit(agent, datamodule)
+    trainer.fit(agent, datamodule, ckpt_path=cfg.get("ckpt_path"), weights_only=False)
+    return agent, datamodule
 
 
 def test_sac_fast_dev_run(tmp_path) -> None:
@@ -32,10 +34,157 @@ def test_sac_fast_dev_run(tmp_path) -> None:
 
 
 def test_ppo_cartpole_fast_dev_run(tmp_path) -> None:
-    """PPO discrete + CartPole debug run must complete without errors."""
-    _fit(["experiment=ppo_debug"], tmp_path)
+    """PPO discrete + CartPole debug run must complete and record finished episodes."""
+    _, dm = _fit(["experiment=ppo_debug", "agent.num_envs=4", "env.num_envs=4"], tmp_path)
+    assert len(dm.episode_rewards) > 0 and len(dm.episode_lengths) == len(dm.episode_rewards)
 
 
 def test_dqn_cartpole_fast_dev_run(tmp_path) -> None:
     """DQN + CartPole debug run must complete without errors."""
     _fit(["experiment=dqn_debug"], tmp_path)
+
+
+def test_ppo_pipelined_fast_dev_run(tmp_path) -> None:
+    """PPO with background collection overlapping the update must complete."""
+    agent, dm = _fit(["experiment=ppo_debug", "agent.pipelined=true"], tmp_path)
+    assert agent._collector is None
+    assert len(dm.episode_rewards) > 0
+    # Steps are counted as rollouts are handed to the learner: 5 rounds of 2 envs x 64 steps
+    assert agent._global_step == 640
+
+
+def test_ppo_shared_trunk_fast_dev_run(tmp_path) -> None:
+    """PPO with a fully shared actor-critic trunk must complete."""
+    _fit(["experiment=ppo_debug", "agent.actor_critic.shared_layers=2"], tmp_path)
+
+
+def test_ppo_normalized_fast_dev_run(tmp_path) -> None:
+    """PPO with in-network obs normalisation and return-based reward scaling must complete."""
+    agent, _ = _fit(
+        ["experiment=ppo_debug", "agent.actor_critic.normalize_obs=true", "agent.normalize_reward=true"], tmp_path
+    )
+    assert agent.actor_critic.obs_normalizer.count > 1
+
+
+def test_sac_normalized_obs_fast_dev_run(tmp_path) -> None:
+    """SAC with obs normalisers in actor, critic and target critic must keep them in sync."""
+    overrides = ["experiment=debug", "env.normalize_obs=false"]
+    agent, _ = _fit([*overrides, "agent.actor.normalize_obs=true", "agent.critic.normalize_obs=true"], tmp_path)
+    assert agent.critic.obs_normalizer.count > 1
+    assert torch.equal(agent.critic_target.obs_normalizer.mean, agent.critic.obs_normalizer.mean)
+
+
+def test_sac_redq_ensemble_fast_dev_run(tmp_path) -> None:
+    """SAC with a 10-member critic ensemble and a 2-critic target subset must complete."""
+    agent, _ = _fit(["experiment=debug", "agent.critic.num_critics=10", "agent.num_target_critics=2"], tmp_path)
+    assert agent.critic.layers[0].weight.shape[0] == 10
+
+
+@pytest.mark.parametrize("prioritized", [False, True])
+def test_sac_batched_utd_fast_dev_run(prioritized: bool, tmp_path) -> None:
+    """SAC with batched multi-step updates and a delayed actor must complete."""
+    overrides = [
+        "experiment=debug",
+        "agent.gradient_steps=4",
+        "agent.batched_updates=true",
+        "agent.policy_delay=2",
+        f"env.prioritized={str(prioritized).lower()}",
+    ]
+    agent, _ = _fit(overrides, tmp_path)
+    assert agent._critic_update_count == 4
+
+
+@pytest.mark.parametrize("experiment", ["ppo_debug", "dqn_debug"])
+def test_episode_logger_evaluates_both_datamodules(experiment: str, tmp_path) -> None:
+    """Batched evaluation must run for PPO's RolloutDataModule as well as RLDataModule."""
+    overrides = [
+        f"experiment={experiment}",
+        "callbacks.episode_logger.log_every_n_epochs=1",
+        "callbacks.episode_logger.eval_episodes=5",
+        "callbacks.episode_logger.num_eval_envs=2",
+    ]
+    agent, _ = _fit(overrides, tmp_path)
+    metrics = agent.trainer.callback_metrics
+    assert metrics["eval/mean_episode_length"] > 0
+    assert "eval/mean_episode_reward" in metrics
+
+
+def test_episode_logger_respects_step_budget(tmp_path) -> None:
+    """max_eval_steps must cap evaluation and still log the partial episodes."""
+    overrides = [
+        "experiment=dqn_debug",
+        "callbacks.episode_logger.log_every_n_epochs=1",
+        "callbacks.episode_logger.eval_episodes=4",
+        "callbacks.episode_logger.max_eval_steps=20",
+    ]
+    with pytest.warns(UserWarning, match="max_eval_steps"):
+        agent, _ = _fit(overrides, tmp_path)
+    assert agent.trainer.callback_metrics["eval/mean_episode_length"] <= 5
+
+
+def test_dqn_prioritized_fast_dev_run(tmp_path) -> None:
+    """DQN with prioritized replay must complete its weighted updates."""
+    _fit(["experiment=dqn_debug", "env.prioritized=true", "agent.learning_starts=50"], tmp_path)
+
+
+def test_sac_vector_env_fast_dev_run(tmp_path) -> None:
+    """SAC collecting from a vector env must complete without errors."""
+    agent, _ = _fit(["experiment=debug", "env.num_envs=2", "agent.collect_steps_per_update=3"], tmp_path)
+    assert agent._total_env_steps % 2 == 0
+
+
+def test_dqn_vector_env_counts_every_env_step(tmp_path) -> None:
+    """DQN on a vector env must count num_envs steps per training step."""
+    num_envs = 4
+    agent, dm = _fit(["experiment=dqn_debug", f"env.num_envs={num_envs}", "agent.train_frequency=10"], tmp_path)
+    assert agent._cycles_per_training_step == 3  # ceil(train_frequency / num_envs)
+    prefill = agent._total_env_steps - 5 * 20 * 3 * num_envs  # dqn_debug: 5 epochs of 20 training steps
+    assert prefill >= 100
+    assert prefill % num_envs == 0
+    assert len(dm.episode_rewards) > 0
+
+
+def test_dqn_consumes_every_sampled_batch(tmp_path) -> None:
+    """With the default cycle count, every batch the dataloader yields must feed exactly one update."""
+    agent, _ = _fit(["experiment=dqn_debug", "agent.train_frequency=10"], tmp_path)
+    training_steps = 5 * 20  # dqn_debug: 5 epochs of 20 training steps
+    assert agent._cycles_per_training_step == 10
+    # Manual optimization: global_step counts optimizer steps, one per training_step
+    assert agent.trainer.global_step == training_steps
+
+
+def test_dqn_double_dueling_multi_step_fast_dev_run(tmp_path) -> None:
+    """Double DQN collecting several env steps per training_step must run one update per train_frequency steps."""
+    overrides = [
+        "experiment=dqn_debug",
+        "agent.double_q=true",
+        "agent.fused_online_forward=true",
+        "agent.steps_per_training_step=4",
+        "agent.train_frequency=2",
+    ]
+    agent, _ = _fit(overrides, tmp_path)
+    prefill = agent._total_env_steps - 5 * 20 * 4  # dqn_debug: 5 epochs of 20 training steps
+    assert prefill >= 100
+    assert len(agent.trainer.optimizers[0].state) > 0
+
+
+@pytest.mark.parametrize("agent_name", ["sac", "td3"])
+def test_actor_critic_chunked_training_step(agent_name: str, tmp_path) -> None:
+    """One training_step with steps_per_training_step=3 must run three collect/update cycles."""
+    overrides = ["experiment=debug", f"agent={agent_name}", "agent.steps_per_training_step=3", "agent.policy_delay=1"]
+    agent, _ = _fit(overrides, tmp_path)
+    assert agent._critic_update_count == 3
+    assert "train/critic_loss" in agent.trainer.callback_metrics
+
+
+def test_dqn_resume_from_checkpoint(tmp_path) -> None:
+    """Resuming from a checkpoint must restore the replay buffer instead of re-prefilling it."""
+    overrides = ["experiment=dqn_debug", f"+trainer.default_root_dir={tmp_path}"]
+    first, first_dm = _fit([*overrides, "trainer.max_epochs=2"], tmp_path)
+    ckpt = tmp_path / "checkpoints" / "last.ckpt"
+    assert (tmp_path / "checkpoints" / "replay_buffer" / "chunk_00000.npz").exists()
+
+    resumed, resumed_dm = _fit([*overrides, "trainer.max_epochs=3", f"+ckpt_path={ckpt}"], tmp_path)
+    steps_per_epoch = 20  # dqn_debug: one env step per training step
+    assert resumed._total_env_steps == first._total_env_steps + steps_per_epoch
+    assert len(resumed_dm.replay_buffer) == len(first_dm.replay_buffer) + steps_per_epoch